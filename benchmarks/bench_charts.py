@@ -0,0 +1,126 @@
+"""
+Compare the cost of a population chart update before and after the ring buffers.
+
+The former path appends to the history with np.append, clears the axes and plots them again.
+The current path appends to a PopulationHistory and blits persistent lines. Both draw on offscreen
+Agg canvases. Run from the repository root:
+
+    python -m benchmarks.bench_charts
+    python -m benchmarks.bench_charts --windows 100 1000 --ticks 300
+"""
+
+import argparse
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from charts import BlitChart
+from history import PopulationHistory
+
+
+def populations(ticks: int) -> np.ndarray:
+    """Oscillating rabbit and fox populations
+
+    Arguments:
+        ticks -- number of ticks
+
+    Returns:
+        populations in percent, of shape (ticks, 2)
+    """
+    phase = np.arange(ticks) / 20
+    return np.stack([30 + 20*np.sin(phase), 8 + 6*np.sin(phase - 1)], axis=1)
+
+
+def former_update_time(data: np.ndarray, window: int) -> float:
+    """Average time of a chart update with np.append and full re-plotting
+
+    Arguments:
+        data -- populations of every tick
+        window -- number of ticks shown
+
+    Returns:
+        seconds per update
+    """
+    canvas1, canvas2 = FigureCanvasAgg(Figure()), FigureCanvasAgg(Figure())
+    ax1, ax2 = canvas1.figure.add_subplot(), canvas2.figure.add_subplot()
+    rabbit_history = np.array([], dtype=[('population', '<f4'), ('time', '<i4')])
+    fox_history = np.array([], dtype=[('population', '<f4'), ('time', '<i4')])
+    start = time.perf_counter()
+    for rabbit_number, fox_number in data:
+        rabbit = np.array([(rabbit_number, len(rabbit_history))], dtype=rabbit_history.dtype)
+        fox = np.array([(fox_number, len(rabbit_history))], dtype=fox_history.dtype)
+        if len(rabbit_history) < window:
+            rabbit_history = np.append(rabbit_history, rabbit, axis=0)
+            fox_history = np.append(fox_history, fox, axis=0)
+        else:
+            rabbit_history = np.append(rabbit_history[1:], rabbit, axis=0)
+            fox_history = np.append(fox_history[1:], fox, axis=0)
+            rabbit_history['time'] = np.arange(len(rabbit_history))
+            fox_history['time'] = np.arange(len(fox_history))
+
+        ax1.clear()
+        ax1.plot(rabbit_history['population'], fox_history['population'], 'bo', markersize=3)
+        ax1.set_xlabel("rabbits population")
+        ax1.set_ylabel("foxes population")
+        canvas1.draw()
+        ax2.clear()
+        ax2.plot('time', 'population', data=rabbit_history, color='green', linewidth=1, label="Rabbit")
+        ax2.plot('time', 'population', data=fox_history, color='red', linewidth=1, label="Fox")
+        ax2.set_xticks([])
+        ax2.legend()
+        canvas2.draw()
+    return (time.perf_counter() - start) / len(data)
+
+
+def current_update_time(data: np.ndarray, window: int) -> float:
+    """Average time of a chart update with the ring buffer and blitted lines
+
+    Arguments:
+        data -- populations of every tick
+        window -- number of ticks shown
+
+    Returns:
+        seconds per update
+    """
+    canvas1, canvas2 = FigureCanvasAgg(Figure()), FigureCanvasAgg(Figure())
+    ax1, ax2 = canvas1.figure.add_subplot(), canvas2.figure.add_subplot()
+    line1, = ax1.plot([], [], 'bo', markersize=3)
+    rabbit_line, = ax2.plot([], [], color='green', linewidth=1, label="Rabbit")
+    fox_line, = ax2.plot([], [], color='red', linewidth=1, label="Fox")
+    ax2.legend()
+    chart1 = BlitChart(canvas1, ax1, [line1], xlim=10, ylim=30)
+    chart2 = BlitChart(canvas2, ax2, [rabbit_line, fox_line], xlim=window, ylim=40)
+    history = PopulationHistory(window)
+    ticks = np.arange(window)
+    start = time.perf_counter()
+    for rabbit_number, fox_number in data:
+        history.append(rabbit_number, fox_number)
+        rabbit, fox = history.rabbit, history.fox
+        chart1.update([(rabbit, fox)], rabbit.max(), fox.max())
+        chart2.update([(ticks[:len(history)], rabbit), (ticks[:len(history)], fox)], 0, max(rabbit.max(), fox.max()))
+        # Agg canvases have no event loop, run the pending full redraws now
+        for chart in (chart1, chart2):
+            if chart.background is None:
+                chart.canvas.draw()
+    return (time.perf_counter() - start) / len(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--windows', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--ticks', type=int, nargs='+', default=[200, 1000])
+    args = parser.parse_args()
+
+    print(f"{'window':>7} {'ticks':>6} {'former [ms]':>12} {'current [ms]':>13}")
+    for window in args.windows:
+        for ticks in args.ticks:
+            data = populations(ticks)
+            former = former_update_time(data, window)
+            current = current_update_time(data, window)
+            print(f"{window:>7} {ticks:>6} {1000*former:>12.2f} {1000*current:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
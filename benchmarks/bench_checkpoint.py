@@ -0,0 +1,47 @@
+"""
+Measure the time to save, load and fork a checkpoint of a simulation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_checkpoint
+    python -m benchmarks.bench_checkpoint --sizes 100 2000 --forks 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from checkpoint import Checkpoint
+from simulation import Simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--forks', type=int, default=1000, help="branches forked from one checkpoint")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'world size':>10} {'file [KiB]':>11} {'save [ms]':>10} {'load [ms]':>10} {'fork [ms]':>10}")
+    for world_size in args.sizes:
+        simulation = Simulation(world_size=world_size, seed=args.seed)
+        simulation.step(10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.ckpt')
+            start = time.perf_counter()
+            simulation.checkpoint().save(path)
+            save = time.perf_counter() - start
+            start = time.perf_counter()
+            checkpoint = Checkpoint.load(path)
+            load = time.perf_counter() - start
+            size = os.path.getsize(path) / 1024
+        start = time.perf_counter()
+        for seed in range(args.forks):
+            Simulation.fork(checkpoint, seed=seed)
+        fork = (time.perf_counter() - start) / args.forks
+        print(f"{world_size:>10} {size:>11.0f} {1000*save:>10.2f} {1000*load:>10.2f} {1000*fork:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare an ensemble of stacked worlds with the same worlds run one by one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ensemble
+    python -m benchmarks.bench_ensemble --worlds 500 --world-size 50 --ticks 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from simulation import Ensemble, Simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--worlds', type=int, default=200)
+    parser.add_argument('--world-size', type=int, nargs='+', default=[10, 20, 50])
+    parser.add_argument('--ticks', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    seeds = np.random.SeedSequence(args.seed).spawn(args.worlds)
+    print(f"{'size':>6} {'one by one [s]':>15} {'ensemble [s]':>13} {'speedup':>8}")
+    for world_size in args.world_size:
+        start = time.perf_counter()
+        for seed in seeds:
+            simulation = Simulation(world_size=world_size, seed=seed)
+            for _ in range(args.ticks):
+                simulation.population()
+                simulation.step()
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Ensemble(seeds, world_size=world_size).run(args.ticks)
+        ensemble = time.perf_counter() - start
+        print(f"{world_size:>6} {sequential:>15.2f} {ensemble:>13.2f} {sequential / ensemble:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
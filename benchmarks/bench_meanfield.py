@@ -0,0 +1,45 @@
+"""
+Measure the mean-field solver on batches of random parameter sets against one agent-based run.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_meanfield
+    python -m benchmarks.bench_meanfield --sets 100 10000 100000 --ticks 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from meanfield import coefficients, solve
+from simulation import Simulation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sets', type=int, nargs='+', default=[1, 100, 1000, 10000])
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--world-size', type=int, default=100, help="size of the agent-based reference run")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    simulation = Simulation(world_size=args.world_size, seed=args.seed)
+    start = time.perf_counter()
+    simulation.step(args.ticks)
+    reference = time.perf_counter() - start
+    print(f"one agent-based run of {args.world_size}x{args.world_size}: {reference:.2f} s")
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'sets':>7} {'time [s]':>9} {'sets/s':>10}")
+    for sets in args.sets:
+        coefficient = coefficients(rng.uniform(0.01, 0.1, sets), rng.uniform(0.3, 1, sets),
+                                   rng.uniform(0.05, 0.3, sets), rng.uniform(0.3, 1, sets))
+        start = time.perf_counter()
+        solve(np.array([20.0, 2.0]), coefficient, args.ticks)
+        elapsed = time.perf_counter() - start
+        print(f"{sets:>7} {elapsed:>9.3f} {sets / elapsed:>10.0f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the initial placement of the animals with the former setdiff1d path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_placement
+    python -m benchmarks.bench_placement --sizes 100 500 --densities 20,2 60,30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from engine import EMPTY, FOX, RABBIT
+from simulation import place_agents
+
+
+def place_agents_setdiff(matrix_sim: np.ndarray, initial_rabbit: int, initial_foxes: int,
+                         rng: np.random.Generator) -> None:
+    """Former placement, the foxes are drawn from the set difference of every cell and the rabbits
+
+    Arguments:
+        matrix_sim -- world matrix, overwritten in place
+        initial_rabbit -- initial rabbit population in percent
+        initial_foxes -- initial foxes population in percent
+        rng -- random generator
+    """
+    area = matrix_sim.size
+    matrix_sim.fill(EMPTY)
+    rabbit_number = int((initial_rabbit/100) * area)
+    fox_number = int((initial_foxes/100) * area)
+    ind_1 = rng.choice(area, rabbit_number, replace=False)
+    ind_2 = rng.choice(np.setdiff1d(np.arange(area), ind_1), fox_number, replace=False)
+    matrix_sim.flat[ind_1] = RABBIT
+    matrix_sim.flat[ind_2] = FOX
+
+
+def seconds_per_call(place, world_size: int, initial_rabbit: int, initial_foxes: int, seed: int,
+                     budget: float = 1.0) -> float:
+    """Time a placement function, repeated until a time budget is spent
+
+    Arguments:
+        place -- placement function
+        world_size -- size of the world
+        initial_rabbit -- initial rabbit population in percent
+        initial_foxes -- initial foxes population in percent
+        seed -- seed of the random generator
+
+    Keyword Arguments:
+        budget -- seconds spent on the measure, at least one call is made (default: {1.0})
+
+    Returns:
+        seconds per call
+    """
+    matrix_sim = np.zeros((world_size, world_size), dtype=int)
+    rng = np.random.default_rng(seed)
+    calls = 0
+    start = time.perf_counter()
+    while not calls or time.perf_counter() - start < budget:
+        place(matrix_sim, initial_rabbit, initial_foxes, rng)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--densities', nargs='+', default=['20,2', '1,1', '60,30'],
+                        help="initial rabbit and fox populations in percent")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'world size':>10} {'rabbit,fox':>10} {'setdiff1d [ms]':>15} {'place_agents [ms]':>18} {'speedup':>8}")
+    for world_size in args.sizes:
+        for density in args.densities:
+            initial_rabbit, initial_foxes = (int(value) for value in density.split(','))
+            before = seconds_per_call(place_agents_setdiff, world_size, initial_rabbit, initial_foxes, args.seed)
+            after = seconds_per_call(place_agents, world_size, initial_rabbit, initial_foxes, args.seed)
+            print(f"{world_size:>10} {density:>10} {1000*before:>15.2f} {1000*after:>18.2f} {before/after:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
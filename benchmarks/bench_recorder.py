@@ -0,0 +1,72 @@
+"""
+Measure the cost of recording a trajectory on the simulation loop, and the size on disk.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_recorder
+    python -m benchmarks.bench_recorder --world-size 1000 --ticks 200 --every 1 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from recorder import TrajectoryReader, TrajectoryRecorder
+from simulation import Simulation
+
+
+def run(world_size: int, ticks: int, seed: int, path: str | None = None, every: int = 1) -> float:
+    """Run a simulation, recording it when a path is given
+
+    Arguments:
+        world_size -- size of the world
+        ticks -- number of ticks
+        seed -- seed of the simulation
+
+    Keyword Arguments:
+        path -- trajectory directory (default: {None} for no recording)
+        every -- number of ticks between two recorded frames (default: {1})
+
+    Returns:
+        seconds per tick, including the time to flush the recorder
+    """
+    simulation = Simulation(world_size=world_size, seed=seed)
+    start = time.perf_counter()
+    if path is None:
+        for _ in range(ticks):
+            simulation.population()
+            simulation.step()
+    else:
+        with TrajectoryRecorder(path, world_size, every=every) as recorder:
+            for _ in range(ticks):
+                recorder.record(simulation.tick, simulation.matrix_sim, simulation.population())
+                simulation.step()
+    return (time.perf_counter() - start) / ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--world-size', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--every', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'every':>6} {'tick [ms]':>10} {'overhead':>9} {'frame [KiB]':>12} {'seek [ms]':>10}")
+    baseline = run(args.world_size, args.ticks, args.seed)
+    print(f"{'-':>6} {1000*baseline:>10.2f} {'':>9} {'':>12} {'':>10}")
+    for every in args.every:
+        with tempfile.TemporaryDirectory() as path:
+            tick_time = run(args.world_size, args.ticks, args.seed, path, every)
+            size = os.path.getsize(os.path.join(path, 'frames.bin'))
+            with TrajectoryReader(path) as reader:
+                start = time.perf_counter()
+                reader.frame(reader.frame_ticks[len(reader) // 2])
+                seek = time.perf_counter() - start
+                frame_size = size / len(reader) / 1024
+        print(f"{every:>6} {1000*tick_time:>10.2f} {tick_time / baseline - 1:>9.0%} {frame_size:>12.1f} {1000*seek:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
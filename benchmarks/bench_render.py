@@ -0,0 +1,84 @@
+"""
+Compare the frame time of the world view drawn with pcolormesh and with the blitting renderer.
+
+Both draw on an offscreen Agg canvas. Run from the repository root:
+
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --sizes 100 500 --frames 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+
+from benchmarks.bench_step import make_world
+from renderer import WorldRenderer
+
+MAP_COLORS = ListedColormap(['white', 'red', 'green'])
+
+
+def pcolormesh_frame_time(worlds: list[np.ndarray], size_inches: float) -> float:
+    """Average frame time of the former pcolormesh view
+
+    Arguments:
+        worlds -- world matrices of the frames
+        size_inches -- width and height of the figure
+
+    Returns:
+        seconds per frame
+    """
+    fig = Figure(figsize=(size_inches, size_inches))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    plot = ax.pcolormesh(worlds[0], cmap=MAP_COLORS, edgecolors='k', linewidth=0)
+    ax.axis('off')
+    canvas.draw()
+    start = time.perf_counter()
+    for matrix_sim in worlds:
+        plot.set_array(matrix_sim.ravel())
+        canvas.draw()
+    return (time.perf_counter() - start) / len(worlds)
+
+
+def renderer_frame_time(worlds: list[np.ndarray], size_inches: float) -> float:
+    """Average frame time of WorldRenderer
+
+    Arguments:
+        worlds -- world matrices of the frames
+        size_inches -- width and height of the figure
+
+    Returns:
+        seconds per frame
+    """
+    fig = Figure(figsize=(size_inches, size_inches))
+    canvas = FigureCanvasAgg(fig)
+    renderer = WorldRenderer(canvas, MAP_COLORS, worlds[0], frames=len(worlds))
+    canvas.draw()
+    for matrix_sim in worlds:
+        renderer.update(matrix_sim)
+    return renderer.frame_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--size-inches', type=float, default=6.4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'size':>6} {'pcolormesh [ms]':>16} {'renderer [ms]':>14}")
+    for world_size in args.sizes:
+        worlds = [make_world(world_size, rng) for _ in range(args.frames)]
+        mesh = pcolormesh_frame_time(worlds, args.size_inches)
+        image = renderer_frame_time(worlds, args.size_inches)
+        print(f"{world_size:>6} {1000*mesh:>16.1f} {1000*image:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
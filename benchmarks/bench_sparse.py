@@ -0,0 +1,53 @@
+"""
+Compare the tick time of the dense and the sparse representation at several occupancies.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sparse
+    python -m benchmarks.bench_sparse --world-size 1000 --densities 1 5 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_step import PARAMETERS
+from engine import AgentIndex, count_population, step_sparse, step_vectorized
+from simulation import place_agents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--world-size', type=int, default=2000)
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.5, 1, 2, 5, 10, 20],
+                        help="occupied percentage of the world, 80%% rabbits and 20%% foxes")
+    parser.add_argument('--ticks', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'density [%]':>11} {'dense [ms]':>11} {'sparse [ms]':>12}")
+    for density in args.densities:
+        dense = np.zeros((args.world_size, args.world_size), dtype=int)
+        place_agents(dense, 0.8 * density, 0.2 * density, np.random.default_rng(args.seed))
+        sparse = dense.copy()
+        agents = AgentIndex(sparse)
+
+        rng = np.random.default_rng(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            step_vectorized(dense, *PARAMETERS, rng=rng)
+            count_population(dense)
+        dense_time = (time.perf_counter() - start) / args.ticks
+
+        rng = np.random.default_rng(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            step_sparse(sparse, agents, *PARAMETERS, rng=rng)
+            agents.population(sparse.size)
+        sparse_time = (time.perf_counter() - start) / args.ticks
+        print(f"{density:>11} {1000*dense_time:>11.2f} {1000*sparse_time:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Measure the startup time, import time and peak memory of a headless run, of the command line and of the GUI.
+
+Every case runs in a fresh interpreter. The GUI case reports the time to the first frame of the
+world view and to the first drawing of the charts, from the launch of the interpreter. The import
+time is the total of the top-level imports reported by python -X importtime, in a separate run.
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --imports 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEADLESS = """
+import resource, sys, json
+from simulation import Simulation
+simulation = Simulation()
+simulation.step({ticks})
+print(json.dumps({{
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'qt': 'PyQt6' in sys.modules,
+    'matplotlib': 'matplotlib' in sys.modules,
+}}))
+"""
+
+CLI = """
+import resource, sys, json
+import main
+sys.argv = ['main.py', '--help']
+try:
+    main.main()
+except SystemExit:
+    pass
+print(json.dumps({{
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'qt': 'PyQt6' in sys.modules,
+    'matplotlib': 'matplotlib' in sys.modules,
+}}))
+"""
+
+GUI = """
+import resource, sys, json, time
+import PyQt6.QtWidgets as qtw
+from window import UI
+app = qtw.QApplication([])
+window = UI()
+window.show()
+times = {{}}
+window.canvas.mpl_connect('draw_event', lambda event: times.setdefault('frame', time.monotonic()))
+deadline = time.monotonic() + 30
+while 'frame' not in times or window.chart2 is None or window.chart2.background is None:
+    app.processEvents()
+    if time.monotonic() > deadline:
+        raise TimeoutError("the window was not drawn")
+times['charts'] = time.monotonic()
+for _ in range({ticks}):
+    window.update_model()
+app.processEvents()
+print(json.dumps({{
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'qt': 'PyQt6' in sys.modules,
+    'matplotlib': 'matplotlib' in sys.modules,
+    **times,
+}}))
+"""
+
+CASES = {'headless': HEADLESS, 'cli': CLI, 'gui': GUI}
+
+
+def run_case(code: str, ticks: int) -> dict:
+    """Run a case in a fresh interpreter
+
+    Arguments:
+        code -- source of the case
+        ticks -- number of ticks to run after startup
+
+    Returns:
+        wall time in seconds, peak resident memory in MiB, the imported GUI libraries and, for the GUI,
+        the seconds from the launch to the first frame and to the first drawing of the charts
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    # time.monotonic is the same clock in every process, so the child reports when its frames are drawn
+    start = time.monotonic()
+    output = subprocess.run([sys.executable, '-c', code.format(ticks=ticks)], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    wall = time.monotonic() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    result['maxrss'] /= 1024
+    result['wall'] = wall
+    for name in ('frame', 'charts'):
+        if name in result:
+            result[name] -= start
+    return result
+
+
+def import_times(code: str) -> list[tuple[str, float]]:
+    """Run a case with python -X importtime
+
+    Arguments:
+        code -- source of the case
+
+    Returns:
+        name and cumulative seconds of every top-level import, slowest first
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code.format(ticks=0)], env=env,
+                            capture_output=True, text=True, check=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(' '):
+            imports.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(imports, key=lambda item: -item[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=0, help="ticks to run after startup")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--imports', type=int, default=5, help="number of slowest top-level imports printed per case")
+    args = parser.parse_args()
+
+    print(f"{'case':>9} {'wall [s]':>9} {'imports [s]':>12} {'first frame [s]':>16} {'charts [s]':>11} "
+          f"{'peak [MiB]':>11} {'qt':>5} {'matplotlib':>11}")
+    slowest = {}
+    for name, code in CASES.items():
+        results = [run_case(code, args.ticks) for _ in range(args.repeat)]
+        best = min(results, key=lambda result: result['wall'])
+        imports = min((import_times(code) for _ in range(args.repeat)), key=lambda items: sum(t for _, t in items))
+        slowest[name] = imports[:args.imports]
+        frame = f"{best['frame']:.3f}" if 'frame' in best else '-'
+        charts = f"{best['charts']:.3f}" if 'charts' in best else '-'
+        print(f"{name:>9} {best['wall']:>9.3f} {sum(t for _, t in imports):>12.3f} {frame:>16} {charts:>11} "
+              f"{best['maxrss']:>11.1f} {str(best['qt']):>5} {str(best['matplotlib']):>11}", flush=True)
+    for name, imports in slowest.items():
+        print(f"{name}: " + ', '.join(f"{module} {1000*seconds:.0f} ms" for module, seconds in imports))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare the ticks per second of the step engines on several world sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_step
+    python -m benchmarks.bench_step --sizes 100 500 --min-time 5
+    python -m benchmarks.bench_step --boundary toroidal --neighbourhood von_neumann
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from engine import ENGINES
+from simulation import place_agents
+from topology import BOUNDARIES, NEIGHBOURHOODS, get_topology
+
+# Same values as the defaults in main.ui
+INITIAL_RABBIT = 20
+INITIAL_FOXES = 2
+PARAMETERS = (0.04, 0.8, 0.15, 0.7)
+
+
+def make_world(world_size: int, rng: np.random.Generator) -> np.ndarray:
+    """Create a world with the default initial populations, placed as in Simulation
+
+    Arguments:
+        world_size -- size of the world
+        rng -- random generator
+
+    Returns:
+        world matrix
+    """
+    matrix_sim = np.zeros((world_size, world_size), dtype=int)
+    place_agents(matrix_sim, INITIAL_RABBIT, INITIAL_FOXES, rng)
+    return matrix_sim
+
+
+def ticks_per_second(step, world_size: int, min_time: float, max_ticks: int, seed: int,
+                     boundary: str = 'clamped', neighbourhood: str = 'moore') -> float:
+    """Measure how many ticks per second an engine runs
+
+    At least one tick is always measured, so slow engines finish after a single tick.
+
+    Arguments:
+        step -- step function of the engine
+        world_size -- size of the world
+        min_time -- minimal measuring time in seconds
+        max_ticks -- maximal number of ticks
+        seed -- seed of the random generator
+
+    Keyword Arguments:
+        boundary -- edges of the world (default: {'clamped'})
+        neighbourhood -- neighbours of a cell (default: {'moore'})
+
+    Returns:
+        ticks per second
+    """
+    rng = np.random.default_rng(seed)
+    # Warm up on a small world, so compiled engines are not timed while compiling
+    step(make_world(10, rng), *PARAMETERS, rng=rng, topology=get_topology(10, boundary, neighbourhood))
+    matrix_sim = make_world(world_size, rng)
+    topology = get_topology(world_size, boundary, neighbourhood)
+    ticks = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while ticks < max_ticks and (ticks == 0 or elapsed < min_time):
+        step(matrix_sim, *PARAMETERS, rng=rng, topology=topology)
+        ticks += 1
+        elapsed = time.perf_counter() - start
+    return ticks / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--min-time', type=float, default=2.0, help="minimal measuring time per case in seconds")
+    parser.add_argument('--max-ticks', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--boundary', choices=list(BOUNDARIES), default='clamped')
+    parser.add_argument('--neighbourhood', choices=list(NEIGHBOURHOODS), default='moore')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'size':>6} " + ' '.join(f"{name:>12}" for name in args.engines) + f" {'speedup':>9}")
+    for world_size in args.sizes:
+        for name in args.engines:
+            results[name] = ticks_per_second(ENGINES[name], world_size, args.min_time, args.max_ticks, args.seed,
+                                             args.boundary, args.neighbourhood)
+        line = f"{world_size:>6} " + ' '.join(f"{results[name]:>12.3f}" for name in args.engines)
+        if 'loop' in results and 'vectorized' in results:
+            line += f" {results['vectorized'] / results['loop']:>8.0f}x"
+        print(line, flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Measure how the throughput of a parameter sweep scales with the number of processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sweep
+    python -m benchmarks.bench_sweep --runs 64 --ticks 300 --processes 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+
+from sweep import grid_points, parse_range, sweep
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=32)
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--world-size', type=int, default=50)
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=[2 ** i for i in range(os.cpu_count().bit_length())])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    points = grid_points({'breeding_foxes': parse_range(f"0.4:0.9:{args.runs}")})
+    print(f"{'processes':>9} {'runs/min':>10} {'speedup':>8} {'efficiency':>11}")
+    base = None
+    with tempfile.TemporaryDirectory() as directory:
+        for processes in args.processes:
+            throughput = sweep(points, os.path.join(directory, 'sweep.csv'), processes=processes, seed=args.seed,
+                               ticks=args.ticks, world_size=args.world_size)
+            base = base or throughput / processes
+            speedup = throughput / base
+            print(f"{processes:>9} {throughput:>10.1f} {speedup:>7.2f}x {speedup / processes:>10.0%}")
+
+
+if __name__ == '__main__':
+    main()
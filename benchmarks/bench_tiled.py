@@ -0,0 +1,56 @@
+"""
+Measure the ticks per second of the tiled engine against the number of worker processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tiled
+    python -m benchmarks.bench_tiled --world-size 10000 --processes 1 2 4 8 16 --ticks 5
+"""
+
+import argparse
+import os
+import time
+
+from simulation import Simulation
+from tiled import TiledSimulation
+
+
+def ticks_per_second(simulation, ticks: int) -> float:
+    """Measure how many ticks per second a simulation runs, after one tick of warm up
+
+    Arguments:
+        simulation -- Simulation or TiledSimulation
+        ticks -- number of measured ticks
+
+    Returns:
+        ticks per second
+    """
+    simulation.step()
+    start = time.perf_counter()
+    simulation.step(ticks)
+    return ticks / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--world-size', type=int, default=4000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--tiles', type=int, default=None, help="tiles per side (default: from the processes)")
+    parser.add_argument('--ticks', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores, world of {args.world_size}x{args.world_size}")
+    baseline = ticks_per_second(Simulation(world_size=args.world_size, seed=args.seed), args.ticks)
+    print(f"{'processes':>9} {'tiles':>6} {'ticks/s':>9} {'speedup':>8}")
+    print(f"{'-':>9} {'-':>6} {baseline:>9.3f} {'1.00x':>8}")
+    for processes in args.processes:
+        with TiledSimulation(world_size=args.world_size, processes=processes, tiles=args.tiles,
+                             seed=args.seed) as simulation:
+            rate = ticks_per_second(simulation, args.ticks)
+            tiles = simulation.tiles
+        print(f"{processes:>9} {tiles:>6} {rate:>9.3f} {rate / baseline:>7.2f}x", flush=True)
+
+
+if __name__ == '__main__':
+    main()
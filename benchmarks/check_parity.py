@@ -0,0 +1,115 @@
+"""
+Check that step engines give statistically the same population trajectories as a reference engine.
+
+Every engine runs the same replicates, seeded from one fixed seed, for every case of a small grid
+of rates and topologies. For every case and species the time averaged population of the replicates
+of each engine is compared with the first engine, the reference, with a Welch t-test. The script
+exits with status 1 when a t statistic is larger than the threshold. By default, every engine is
+compared with step_loop. Run from the repository root:
+
+    python -m benchmarks.check_parity
+    python -m benchmarks.check_parity --engines loop vectorized --threshold 4
+    python -m benchmarks.check_parity --cases 0
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from benchmarks.bench_step import PARAMETERS, make_world
+from engine import ENGINES, count_population
+from topology import get_topology
+
+# Rates, boundary and neighbourhood of every case, the first one with the defaults of main.ui
+CASES = [
+    (PARAMETERS, 'clamped', 'moore'),
+    (PARAMETERS, 'toroidal', 'von_neumann'),
+    ((0.1, 0.9, 0.1, 0.9), 'clamped', 'moore'),
+    ((0.1, 0.9, 0.1, 0.9), 'toroidal', 'moore'),
+    ((0.2, 0.5, 0.05, 0.5), 'clamped', 'von_neumann'),
+    ((0.2, 0.5, 0.05, 0.5), 'toroidal', 'von_neumann'),
+]
+
+
+def trajectories(step, world_size: int, ticks: int, seeds: list[np.random.SeedSequence],
+                 rates: tuple[float, float, float, float] = PARAMETERS, boundary: str = 'clamped',
+                 neighbourhood: str = 'moore') -> np.ndarray:
+    """Run the replicates of an engine
+
+    Arguments:
+        step -- step function of the engine
+        world_size -- size of the world
+        ticks -- number of ticks of every replicate
+        seeds -- seed of every replicate
+
+    Keyword Arguments:
+        rates -- breeding of rabbits, breeding of foxes, mortality and effectiveness of foxes (default: {PARAMETERS})
+        boundary -- edges of the world (default: {'clamped'})
+        neighbourhood -- neighbours of a cell (default: {'moore'})
+
+    Returns:
+        rabbit and fox populations in percent, of shape (replicates, ticks, 2)
+    """
+    topology = get_topology(world_size, boundary, neighbourhood)
+    result = np.empty((len(seeds), ticks, 2))
+    for replicate, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        matrix_sim = make_world(world_size, rng)
+        for tick in range(ticks):
+            step(matrix_sim, *rates, rng=rng, topology=topology)
+            result[replicate, tick] = count_population(matrix_sim)
+    return result
+
+
+def welch_t(a: np.ndarray, b: np.ndarray) -> float:
+    """Welch t statistic of two samples
+
+    Arguments:
+        a -- first sample
+        b -- second sample
+
+    Returns:
+        t statistic, 0 when both samples are constant and equal
+    """
+    error = np.sqrt(a.var(ddof=1)/len(a) + b.var(ddof=1)/len(b))
+    difference = a.mean() - b.mean()
+    if error == 0:
+        return 0.0 if difference == 0 else np.inf
+    return difference / error
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES),
+                        help="engines to compare, the first one is the reference")
+    parser.add_argument('--world-size', type=int, default=30)
+    parser.add_argument('--ticks', type=int, default=60)
+    parser.add_argument('--replicates', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--threshold', type=float, default=3.0, help="largest accepted absolute t statistic")
+    parser.add_argument('--cases', type=int, nargs='+', choices=range(len(CASES)), default=range(len(CASES)),
+                        help="cases of the grid to run, by number")
+    args = parser.parse_args()
+
+    seeds = np.random.SeedSequence(args.seed).spawn(args.replicates)
+    failed = False
+    for case in args.cases:
+        rates, boundary, neighbourhood = CASES[case]
+        print(f"case {case}: rates {rates}, {boundary} {neighbourhood}")
+        runs = [trajectories(ENGINES[name], args.world_size, args.ticks, seeds, rates, boundary, neighbourhood)
+                for name in args.engines]
+        for name, run in zip(args.engines[1:], runs[1:]):
+            for column, species in enumerate(['rabbit', 'fox']):
+                a, b = runs[0][:, :, column].mean(axis=1), run[:, :, column].mean(axis=1)
+                t = welch_t(a, b)
+                relative = 100 * abs(b.mean() - a.mean()) / a.mean() if a.mean() else 0.0
+                failed |= abs(t) > args.threshold
+                print(f"{species:>6}: {args.engines[0]} {a.mean():6.2f}% {name} {b.mean():6.2f}% "
+                      f"t = {t:+.2f} ({relative:.1f}% apart)")
+    print("FAILED" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
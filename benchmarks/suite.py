@@ -0,0 +1,289 @@
+"""
+Run the reproducible benchmark suite and compare its results with a baseline.
+
+Every scenario does a fixed amount of work from a fixed seed and runs headless: the charts and the
+world view draw on offscreen Agg canvases, and the window of the application, when PyQt6 is
+installed, on the offscreen Qt platform. A scenario is run once to warm up, then timed several
+times, and the median time per operation is saved as JSON with the versions of the machine.
+The comparison exits with status 1 when a scenario is slower than the baseline by more than the
+threshold. Run from the repository root:
+
+    python -m benchmarks.suite run -o baseline.json
+    python -m benchmarks.suite run -o current.json --filter step/ render/
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import functools
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_charts import current_update_time, populations
+from benchmarks.bench_render import renderer_frame_time
+from benchmarks.bench_step import make_world
+from engine import ENGINES
+from simulation import Simulation, place_agents
+
+SEED = 0
+
+# World sizes, initial populations in percent and number of ticks of the step scenarios
+STEP_SIZES = {100: 100, 500: 20, 1000: 5}
+DENSITIES = ((20, 2), (2, 1), (60, 30))
+
+
+def step_time(world_size: int, initial_rabbit: int, initial_foxes: int, engine: str, ticks: int) -> float:
+    """Time the ticks of a new simulation
+
+    Arguments:
+        world_size -- size of the world
+        initial_rabbit -- initial rabbit population in percent
+        initial_foxes -- initial foxes population in percent
+        engine -- name of the step engine
+        ticks -- number of ticks
+
+    Returns:
+        seconds per tick
+    """
+    simulation = Simulation(world_size=world_size, initial_rabbit=initial_rabbit, initial_foxes=initial_foxes,
+                            engine=engine, seed=SEED)
+    start = time.perf_counter()
+    simulation.step(ticks)
+    return (time.perf_counter() - start) / ticks
+
+
+def placement_time(world_size: int, initial_rabbit: int, initial_foxes: int, calls: int) -> float:
+    """Time the initial placement of the animals
+
+    Arguments:
+        world_size -- size of the world
+        initial_rabbit -- initial rabbit population in percent
+        initial_foxes -- initial foxes population in percent
+        calls -- number of placements
+
+    Returns:
+        seconds per placement
+    """
+    matrix_sim = np.zeros((world_size, world_size), dtype=int)
+    rng = np.random.default_rng(SEED)
+    start = time.perf_counter()
+    for _ in range(calls):
+        place_agents(matrix_sim, initial_rabbit, initial_foxes, rng)
+    return (time.perf_counter() - start) / calls
+
+
+def charts_time(window: int, ticks: int) -> float:
+    """Time the update of both population charts
+
+    Arguments:
+        window -- number of ticks shown by the charts
+        ticks -- number of updates
+
+    Returns:
+        seconds per update
+    """
+    return current_update_time(populations(ticks), window)
+
+
+def render_time(world_size: int, frames: int) -> float:
+    """Time the frames of the world view
+
+    Arguments:
+        world_size -- size of the world
+        frames -- number of frames
+
+    Returns:
+        seconds per frame
+    """
+    rng = np.random.default_rng(SEED)
+    return renderer_frame_time([make_world(world_size, rng) for _ in range(frames)], 6.4)
+
+
+@functools.cache
+def _application():
+    """QApplication of the update_model scenarios, created once on the offscreen platform
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import PyQt6.QtWidgets as qtw
+
+    return qtw.QApplication.instance() or qtw.QApplication([])
+
+
+def update_model_time(world_size: int, ticks: int) -> float:
+    """Time the Step button of the application, one tick of the model with the redraw of the window
+
+    Arguments:
+        world_size -- size of the world
+        ticks -- number of ticks
+
+    Returns:
+        seconds per tick
+    """
+    app = _application()
+    from window import UI
+
+    window = UI(seed=SEED)
+    window.show()
+    window.world_size_horizontal_slider.setValue(world_size // 10)
+    app.processEvents()
+    # The slider clamps the size to its range, so a size out of range would time another world
+    if window.simulation.matrix_sim.shape != (world_size, world_size):
+        window.close()
+        raise ValueError(f"The window cannot run a world of size {world_size}, "
+                         f"the slider gave {window.simulation.matrix_sim.shape[0]}")
+    start = time.perf_counter()
+    for _ in range(ticks):
+        window.update_model()
+    elapsed = time.perf_counter() - start
+    window.close()
+    return elapsed / ticks
+
+
+def scenarios() -> dict:
+    """Every scenario of the suite
+
+    Returns:
+        function returning the seconds per operation of every scenario, by name
+    """
+    cases = {}
+    for world_size, ticks in STEP_SIZES.items():
+        for initial_rabbit, initial_foxes in DENSITIES:
+            cases[f'step/vectorized/{world_size}/{initial_rabbit},{initial_foxes}'] = functools.partial(
+                step_time, world_size, initial_rabbit, initial_foxes, 'vectorized', ticks)
+        if 'numba' in ENGINES:
+            cases[f'step/numba/{world_size}/20,2'] = functools.partial(step_time, world_size, 20, 2, 'numba', ticks)
+    for world_size, calls in ((100, 100), (1000, 5)):
+        for initial_rabbit, initial_foxes in DENSITIES:
+            cases[f'placement/{world_size}/{initial_rabbit},{initial_foxes}'] = functools.partial(
+                placement_time, world_size, initial_rabbit, initial_foxes, calls)
+    for window in (100, 1000):
+        cases[f'charts/{window}'] = functools.partial(charts_time, window, 200)
+    for world_size in (100, 1000):
+        cases[f'render/{world_size}'] = functools.partial(render_time, world_size, 20)
+    if importlib.util.find_spec('PyQt6') is not None:
+        # The world size slider of main.ui stops at 300
+        for world_size in (100, 300):
+            cases[f'update_model/{world_size}'] = functools.partial(update_model_time, world_size, 20)
+    return cases
+
+
+def metadata() -> dict:
+    """Versions and machine of a run
+
+    Returns:
+        description of the run, with the commit of the repository when git is available
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'seed': SEED,
+    }
+
+
+def run(names: list[str], repeat: int) -> dict:
+    """Run scenarios
+
+    Arguments:
+        names -- names of the scenarios
+        repeat -- number of timed runs of every scenario
+
+    Returns:
+        median, minimum and every time of every scenario in seconds per operation
+    """
+    cases = scenarios()
+    results = {}
+    print(f"{'scenario':<28} {'median [ms]':>12} {'min [ms]':>10}")
+    for name in names:
+        cases[name]()
+        samples = [cases[name]() for _ in range(repeat)]
+        results[name] = {'median': statistics.median(samples), 'min': min(samples), 'samples': samples}
+        print(f"{name:<28} {1000*results[name]['median']:>12.3f} {1000*results[name]['min']:>10.3f}", flush=True)
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Compare the median times of two runs
+
+    Arguments:
+        baseline -- results of the reference run
+        current -- results of the new run
+        threshold -- relative slowdown over which a scenario is a regression, 0.1 for 10%
+
+    Returns:
+        names of the regressed scenarios
+    """
+    regressions = []
+    print(f"{'scenario':<28} {'baseline [ms]':>14} {'current [ms]':>13} {'change':>8}")
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in baseline or name not in current:
+            print(f"{name:<28} {'only in ' + ('current' if name in current else 'baseline'):>37}")
+            continue
+        before, after = baseline[name]['median'], current[name]['median']
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        elif -change / (1 + change) > threshold:
+            flag = ' faster'
+        print(f"{name:<28} {1000*before:>14.3f} {1000*after:>13.3f} {100*change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="run the scenarios and save the results")
+    run_parser.add_argument('-o', '--output', default='benchmark.json')
+    run_parser.add_argument('--filter', nargs='+', default=None, help="run the scenarios whose name contains a value")
+    run_parser.add_argument('--repeat', type=int, default=5, help="number of timed runs of every scenario")
+    run_parser.add_argument('--list', action='store_true', help="print the names of the scenarios and exit")
+    compare_parser = commands.add_parser('compare', help="flag the regressions of a run against a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="relative slowdown of the median over which a scenario is a regression")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        names = [name for name in scenarios() if args.filter is None or any(part in name for part in args.filter)]
+        if args.list:
+            print('\n'.join(names))
+            return
+        results = {'metadata': metadata(), 'unit': 's', 'results': run(names, args.repeat)}
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+        print(f"Saved {len(names)} scenarios to {args.output}")
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        for name, run_metadata in (('baseline', baseline['metadata']), ('current', current['metadata'])):
+            print(f"{name}: commit {run_metadata['commit']}, python {run_metadata['python']}, "
+                  f"numpy {run_metadata['numpy']}, {run_metadata['platform']}")
+        regressions = compare(baseline['results'], current['results'], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions over {100*args.threshold:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
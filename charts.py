@@ -0,0 +1,90 @@
+"""
+This module contains the population charts of the application.
+
+The lines of a chart are created once and only get new data every tick. They are blitted over
+a cached background, and the whole figure is redrawn only when the data leaves the axis limits
+or the canvas is resized.
+"""
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.lines import Line2D
+
+
+def round_limit(value: float) -> int:
+    """Round a value up to the next multiple of ten above it
+
+    Arguments:
+        value -- largest value shown on an axis
+
+    Returns:
+        upper limit of the axis
+    """
+    return (int(value/10)+1) * 10
+
+
+class BlitChart:
+    """
+    Class to update the lines of a chart without redrawing its figure
+    """
+
+    def __init__(self, canvas: FigureCanvasBase, ax: Axes, lines: list[Line2D], xlim: int, ylim: int) -> None:
+        """Set the initial limits of the chart
+
+        Arguments:
+            canvas -- canvas of the chart
+            ax -- axes of the lines
+            lines -- lines of the chart, they are made animated
+            xlim -- initial upper limit of the x axis
+            ylim -- initial upper limit of the y axis
+        """
+        self.canvas = canvas
+        self.ax = ax
+        self.lines = lines
+        self.initial_limits = (xlim, ylim)
+        for line in lines:
+            line.set_animated(True)
+        self.background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+        self.reset()
+
+    def _on_draw(self, event) -> None:
+        """Cache the background after a full redraw and draw the lines over it
+        """
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def reset(self) -> None:
+        """Remove the data of the lines and restore the initial limits
+        """
+        for line in self.lines:
+            line.set_data([], [])
+        self.xlim, self.ylim = self.initial_limits
+        self.ax.set(xlim=(0, self.xlim), ylim=(0, self.ylim))
+        self.background = None
+        self.canvas.draw_idle()
+
+    def update(self, data: list[tuple[np.ndarray, np.ndarray]], xmax: float, ymax: float) -> None:
+        """Set the data of the lines and draw them
+
+        Arguments:
+            data -- x and y values of every line
+            xmax -- largest x value of the data
+            ymax -- largest y value of the data
+        """
+        for line, (x, y) in zip(self.lines, data):
+            line.set_data(x, y)
+        if xmax >= self.xlim or ymax >= self.ylim:
+            self.xlim = max(self.xlim, round_limit(xmax))
+            self.ylim = max(self.ylim, round_limit(ymax))
+            self.ax.set(xlim=(0, self.xlim), ylim=(0, self.ylim))
+            self.background = None
+        if self.background is None:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            for line in self.lines:
+                self.ax.draw_artist(line)
+            self.canvas.blit(self.ax.bbox)
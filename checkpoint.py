@@ -0,0 +1,107 @@
+"""
+This module contains the checkpoints of a simulation.
+
+A checkpoint holds everything needed to resume a run bit for bit: the parameters, the tick, the
+world, the state of the random generator, whether the agents are kept in lists, and optionally the
+population history of the charts. Checkpoints are plain in-memory objects, so forking many branches
+from one of them only copies the world; they are written to disk as a short JSON header followed by
+the raw bytes of the world and of the history.
+"""
+
+import json
+
+import numpy as np
+
+MAGIC = b'LVCHECKPOINT1\n'
+
+
+class Checkpoint:
+    """
+    Class to hold a snapshot of the complete state of a simulation
+    """
+
+    __slots__ = ('parameters', 'tick', 'rng_state', 'matrix_sim', 'sparse', 'history')
+
+    def __init__(self, parameters: dict, tick: int, rng_state: dict, matrix_sim: np.ndarray, sparse: bool,
+                 history: tuple[int, np.ndarray] | None = None) -> None:
+        """Create a checkpoint, the arrays are kept as they are and must not be modified afterwards
+
+        Arguments:
+            parameters -- keyword arguments of Simulation except the seed
+            tick -- tick of the simulation
+            rng_state -- state of the bit generator, as given by bit_generator.state
+            matrix_sim -- world matrix as uint8
+            sparse -- whether the agents are kept in lists
+
+        Keyword Arguments:
+            history -- capacity and values of the population history (default: {None})
+        """
+        self.parameters = parameters
+        self.tick = tick
+        self.rng_state = rng_state
+        self.matrix_sim = matrix_sim
+        self.sparse = sparse
+        self.history = history
+
+    def to_bytes(self) -> bytes:
+        """Serialize the checkpoint
+
+        Returns:
+            magic line, header length, JSON header, world and history bytes
+        """
+        header = {'parameters': self.parameters, 'tick': self.tick, 'rng_state': self.rng_state,
+                  'shape': self.matrix_sim.shape, 'sparse': self.sparse}
+        if self.history is not None:
+            header['history'] = (self.history[0], len(self.history[1]))
+        header = json.dumps(header, default=lambda value: value.tolist()).encode()
+        parts = [MAGIC, np.uint32(len(header)).tobytes(), header, np.ascontiguousarray(self.matrix_sim).tobytes()]
+        if self.history is not None:
+            parts.append(np.ascontiguousarray(self.history[1], dtype=np.float64).tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Checkpoint':
+        """Deserialize a checkpoint
+
+        Arguments:
+            data -- bytes written by to_bytes
+
+        Returns:
+            checkpoint
+        """
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a checkpoint of the Lotka-Volterra model")
+        offset = len(MAGIC) + 4
+        length = int(np.frombuffer(data, dtype=np.uint32, count=1, offset=len(MAGIC))[0])
+        header = json.loads(data[offset:offset + length])
+        offset += length
+        shape = tuple(header['shape'])
+        matrix_sim = np.frombuffer(data, dtype=np.uint8, count=int(np.prod(shape)), offset=offset).reshape(shape)
+        history = None
+        if 'history' in header:
+            capacity, count = header['history']
+            values = np.frombuffer(data, dtype=np.float64, count=2 * count, offset=offset + matrix_sim.size)
+            history = (capacity, values.reshape(count, 2))
+        return cls(header['parameters'], header['tick'], header['rng_state'], matrix_sim, header['sparse'], history)
+
+    def save(self, path: str) -> None:
+        """Write the checkpoint to a file
+
+        Arguments:
+            path -- path of the file
+        """
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        """Read a checkpoint from a file
+
+        Arguments:
+            path -- path of a file written by save
+
+        Returns:
+            checkpoint
+        """
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
@@ -0,0 +1,613 @@
+"""
+This module contains the step engines of the Lotka-Volterra model.
+
+The world is an integer matrix where 0 is an empty cell, 1 is a fox and 2 is a rabbit.
+The engines advance the world by one tick:
+
+- step_loop visits every agent one at a time, exactly like the original UI.update_model did.
+- step_numba runs the same sequential rules as step_loop in a compiled kernel. It needs numba.
+- step_vectorized moves, breeds, hunts and kills the agents of a species with array operations, in
+  sixteen passes that give the rates of step_loop.
+
+Every engine takes the topology of the world, see topology.py, and looks up the neighbours of a cell
+in its tables. Without one, the world is clamped at its edges with eight neighbours per cell.
+"""
+
+import functools
+import importlib.util
+import warnings
+
+import numpy as np
+
+from topology import Topology, get_topology
+
+EMPTY = 0
+FOX = 1
+RABBIT = 2
+
+# numba is only imported when step_numba first runs, its import takes longer than the rest of a headless start
+HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+
+
+def count_population(matrix_sim: np.ndarray) -> tuple[float, float]:
+    """Count the rabbits and foxes of the world
+
+    Arguments:
+        matrix_sim -- world matrix
+
+    Returns:
+        rabbit and fox population as a percentage of the world area
+    """
+    area = matrix_sim.size
+    rabbit_number = (np.count_nonzero(matrix_sim == RABBIT)/area)*100
+    fox_number = (np.count_nonzero(matrix_sim == FOX)/area)*100
+    return rabbit_number, fox_number
+
+
+def step_loop(matrix_sim: np.ndarray, breeding_rabbits: float, breeding_foxes: float,
+              mortality_foxes: float, effectiveness_foxes: float,
+              rng: np.random.Generator | None = None, topology: Topology | None = None) -> None:
+    """Advance the world by one tick, moving the agents one at a time
+
+    Arguments:
+        matrix_sim -- world matrix, updated in place
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Keyword Arguments:
+        rng -- random generator (default: {None} for a fresh unseeded generator)
+        topology -- topology of the world (default: {None} for a clamped Moore world)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if topology is None:
+        topology = get_topology(matrix_sim.shape[0])
+    rows, cols = topology.rows, topology.cols
+
+    def random_move(x, y, directions_available) -> None:
+        direction = rng.choice(directions_available)
+        directions_available.remove(direction)
+        return rows[x, direction], cols[y, direction], directions_available
+
+    directions_available_arr = list(range(len(topology)))
+    for value in [FOX, RABBIT]:
+        x, y = np.where(matrix_sim == value)
+
+        for i in range(max(len(x),len(y))):
+            new_x, new_y = x[i],y[i]
+            matrix_sim[x[i],y[i]] = EMPTY
+            directions_available = directions_available_arr.copy()
+
+            new_x, new_y, directions_available = random_move(new_x, new_y, directions_available)
+
+            if value == RABBIT and rng.random() <= breeding_rabbits:
+                new_born_x, new_born_y = x[i], y[i]
+                matrix_sim[new_born_x, new_born_y] = value
+
+            directions_available = directions_available_arr.copy()
+
+            while directions_available:
+                new_x, new_y, directions_available = random_move(new_x, new_y, directions_available)
+                if matrix_sim[new_x, new_y] == EMPTY:
+                    directions_available = []
+                    if value == RABBIT and rng.random() <= breeding_rabbits:
+                        new_born_x, new_born_y = x[i], y[i]
+                        x = np.append(x, new_born_x)
+                        y = np.append(y, new_born_y)
+
+                elif value == FOX and matrix_sim[new_x, new_y] == RABBIT:
+                    if rng.random() < effectiveness_foxes:
+                        directions_available = []
+
+                        if rng.random() < breeding_foxes:
+                            new_born_x, new_born_y = x[i], y[i]
+                            matrix_sim[new_born_x, new_born_y] = value
+
+                    else:
+                        new_x, new_y = x[i], y[i]
+                else:
+                    new_x, new_y = x[i], y[i]
+            if (value == FOX and rng.random() > mortality_foxes) or value == RABBIT:
+                matrix_sim[new_x, new_y] = value
+
+
+def _step_kernel(matrix_sim, breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes, rng,
+                 rows, cols):
+    """Sequential rules of step_numba, compiled by _compiled_kernel
+    """
+    world_size = matrix_sim.shape[0]
+    neighbour_count = rows.shape[1]
+    directions = np.empty(neighbour_count, dtype=np.intp)
+    for value in (FOX, RABBIT):
+        count = 0
+        x = np.empty(matrix_sim.size, dtype=np.intp)
+        y = np.empty(matrix_sim.size, dtype=np.intp)
+        for i in range(world_size):
+            for j in range(world_size):
+                if matrix_sim[i, j] == value:
+                    x[count] = i
+                    y[count] = j
+                    count += 1
+
+        for i in range(count):
+            matrix_sim[x[i], y[i]] = EMPTY
+            # The first move is never checked, the search below starts from where it lands
+            direction = rng.integers(0, neighbour_count)
+            new_x = rows[x[i], direction]
+            new_y = cols[y[i], direction]
+
+            if value == RABBIT and rng.random() <= breeding_rabbits:
+                matrix_sim[x[i], y[i]] = value
+
+            for k in range(neighbour_count):
+                directions[k] = k
+            available = neighbour_count
+            while available:
+                k = rng.integers(0, available)
+                direction = directions[k]
+                available -= 1
+                directions[k] = directions[available]
+                new_x = rows[new_x, direction]
+                new_y = cols[new_y, direction]
+                if matrix_sim[new_x, new_y] == EMPTY:
+                    available = 0
+
+                elif value == FOX and matrix_sim[new_x, new_y] == RABBIT:
+                    if rng.random() < effectiveness_foxes:
+                        available = 0
+
+                        if rng.random() < breeding_foxes:
+                            matrix_sim[x[i], y[i]] = value
+
+                    else:
+                        new_x, new_y = x[i], y[i]
+                else:
+                    new_x, new_y = x[i], y[i]
+            if (value == FOX and rng.random() > mortality_foxes) or value == RABBIT:
+                matrix_sim[new_x, new_y] = value
+
+
+@functools.cache
+def _compiled_kernel():
+    """Import numba and compile the kernel of step_numba, on first use
+
+    Returns:
+        compiled _step_kernel, cached on disk by numba across runs
+    """
+    import numba
+
+    return numba.njit(cache=True)(_step_kernel)
+
+
+def step_numba(matrix_sim: np.ndarray, breeding_rabbits: float, breeding_foxes: float,
+               mortality_foxes: float, effectiveness_foxes: float,
+               rng: np.random.Generator | None = None, topology: Topology | None = None) -> None:
+    """Advance the world by one tick with the rules of step_loop, in a compiled kernel
+
+    The agents move one at a time in the same order as in step_loop, so a cell freed by an agent
+    can be taken by the next one. The random draws are not made in the same order, so the two
+    engines give statistically equal runs, not identical ones.
+
+    Arguments:
+        matrix_sim -- world matrix, updated in place
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Keyword Arguments:
+        rng -- random generator (default: {None} for a fresh unseeded generator)
+        topology -- topology of the world (default: {None} for a clamped Moore world)
+    """
+    if not HAVE_NUMBA:
+        raise ImportError("step_numba needs numba, install it with: pip install numba")
+    if rng is None:
+        rng = np.random.default_rng()
+    if topology is None:
+        topology = get_topology(matrix_sim.shape[0])
+    _compiled_kernel()(matrix_sim, breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes, rng,
+                 topology.rows, topology.cols)
+
+
+def _random(rngs: list[np.random.Generator], worlds: np.ndarray, *shape: int) -> np.ndarray:
+    """Draw uniform numbers for the agents of a stack of worlds, each world from its own generator
+
+    Arguments:
+        rngs -- random generator of every world
+        worlds -- world of every agent
+        shape -- shape of the draw of one agent
+
+    Returns:
+        array of shape (len(worlds), *shape), drawn for the agents of a world in their order
+    """
+    if len(rngs) == 1:
+        return rngs[0].random((len(worlds), *shape))
+    counts = np.bincount(worlds, minlength=len(rngs))
+    values = np.empty((len(worlds), *shape))
+    values[np.argsort(worlds, kind='stable')] = np.concatenate(
+        [rng.random((count, *shape)) for rng, count in zip(rngs, counts)])
+    return values
+
+
+# Period of the rows and columns of the passes of _choose_targets, at least 3 so that the agents of
+# a pass cannot reach the cells freed by each other
+_PASS_PERIOD = 4
+
+
+def _passes(index: np.ndarray, topology: Topology) -> tuple[np.ndarray, np.ndarray]:
+    """Split the agents of a species into the passes of _choose_targets
+
+    Arguments:
+        index -- flat indices of the agents, in row-major order
+        topology -- topology of the worlds
+
+    Returns:
+        order of the agents by pass, row-major inside a pass, and the end of every pass in that order
+    """
+    row, col = np.divmod(index % topology.area, topology.world_size)
+    colour = (row % _PASS_PERIOD * _PASS_PERIOD + col % _PASS_PERIOD).astype(np.int8)
+    # A stable sort keeps the agents of a pass in row-major order
+    return np.argsort(colour, kind='stable'), np.cumsum(np.bincount(colour, minlength=_PASS_PERIOD ** 2))
+
+
+def _candidates(index: np.ndarray, topology: Topology, first: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Cells an agent tries, as in step_loop
+
+    An agent tries its neighbours in the order of its keys, smallest first. The first move of
+    step_loop is never checked, so the first try starts from a random neighbour instead of the
+    agent's own cell and may end up to two cells away.
+
+    Arguments:
+        index -- flat indices of the agents
+        topology -- topology of the worlds
+        first -- uniform random numbers choosing the direction of the unchecked move, of shape (len(index),)
+        keys -- uniform random keys ordering the tries, of shape (len(index), len(topology))
+
+    Returns:
+        flat indices of the cells tried by every agent, in the order of topology.directions
+    """
+    rows = np.arange(len(index))
+    candidates = topology.neighbours(index)
+    hop = candidates[rows, (first * len(topology)).astype(np.intp)]
+    direction = keys.argmin(axis=1)
+    candidates[rows, direction] = topology.neighbour(hop, direction)
+    return candidates
+
+
+def _resolve(flat: np.ndarray, index: np.ndarray, candidates: np.ndarray, keys: np.ndarray, value: int,
+             own: np.ndarray, breed: np.ndarray, alive: np.ndarray,
+             caught: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+    """Move agents into the first cell they accept, resolving the conflicts in rounds
+
+    In every round, each agent that is still searching takes its first candidate, from where it
+    stopped, that is empty, that is its own cell when it may come back to it, or that holds
+    a rabbit it catches. When several agents pick the same cell, the first agent in row-major
+    order gets it, and the others go on with their next candidates in the following round,
+    against the world updated by the winners. An agent that runs out of candidates stays in place.
+
+    Arguments are those of _choose_targets, for the agents of one pass, with own the mask of the
+    candidates that are the agent's own cell and that it may come back to.
+
+    Returns:
+        flat index of the cell where each agent ends the tick and whether it left a newborn behind
+    """
+    target = index.copy()
+    born = np.zeros(len(index), dtype=bool)
+    agents = np.arange(len(index))
+    start = None
+    while len(agents):
+        cells = flat[candidates]
+        accept = (cells == EMPTY) | own
+        if caught is not None:
+            accept |= caught & (cells == RABBIT)
+        order = np.where(accept, keys, 2)
+        if start is not None:
+            order[order < start[:, None]] = 2
+        rows = np.arange(len(agents))
+        choice = order.argmin(axis=1)
+        found = order[rows, choice] < 2
+        chosen = candidates[rows, choice]
+
+        # The smallest agent number picking a cell gets it. The agents are in row-major order, so
+        # after a stable sort by cell the first agent of every cell is the winner. Sorting costs time
+        # per agent, a buffer indexed by cell would take memory per cell of the flattened worlds
+        cells_chosen = chosen[found]
+        by_cell = np.argsort(cells_chosen, kind='stable')
+        sorted_cells = cells_chosen[by_cell]
+        first = np.ones(len(by_cell), dtype=bool)
+        first[1:] = sorted_cells[1:] != sorted_cells[:-1]
+        won_found = np.zeros(len(by_cell), dtype=bool)
+        won_found[by_cell[first]] = True
+        won = np.zeros(len(agents), dtype=bool)
+        won[found] = won_found
+
+        winners = agents[won]
+        target[winners] = chosen[won]
+        if caught is None:
+            born[winners] = breed[winners] & (target[winners] != index[winners])
+        else:
+            born[winners] = breed[winners] & (cells[won, choice[won]] == RABBIT)
+        flat[index[winners]] = EMPTY
+        flat[index[winners[born[winners]]]] = value
+        flat[target[winners[alive[winners]]]] = value
+        # An agent without a cell to go to stays in place, or leaves it empty if it dies
+        stuck = agents[~found]
+        flat[index[stuck[~alive[stuck]]]] = EMPTY
+
+        # The losers go on from the cell they lost, which is free again if its winner died
+        lost = found & ~won
+        agents, start = agents[lost], order[lost, choice[lost]]
+        candidates, keys, own = candidates[lost], keys[lost], own[lost]
+        if caught is not None:
+            caught = caught[lost]
+    return target, born
+
+
+def _choose_targets(flat: np.ndarray, index: np.ndarray, passes: np.ndarray, candidates: np.ndarray,
+                    keys: np.ndarray, value: int, home: np.ndarray, breed: np.ndarray, alive: np.ndarray,
+                    caught: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Move the agents of a species into the first cell they accept and resolve the conflicts
+
+    In step_loop an agent sees the cells freed by the agents moved before it. To get the same rates,
+    the agents move in sixteen passes, by their row and column modulo _PASS_PERIOD, in row-major
+    order of these remainders. An agent sees the cells freed by the agents of the earlier passes,
+    which are the agents before it in row-major order, except across the rows and columns where the
+    remainders wrap around. The agents of a pass are at least _PASS_PERIOD cells apart, except across
+    the edges of a toroidal world whose size is not a multiple of it, too far to free a cell another
+    one tries, so inside a pass only the conflicts matter, and _resolve settles them as step_loop would.
+
+    Arguments:
+        flat -- flattened world matrices, updated in place
+        index -- flat indices of the agents, in the order of _passes
+        passes -- end of every pass, see _passes
+        candidates -- flat indices of the cells tried by every agent, see _candidates
+        keys -- uniform random keys ordering the tries of every agent, same shape as candidates
+        value -- species of the agents
+        home -- whether every agent may come back to its own cell
+        breed -- whether every agent leaves a newborn behind when it moves, or when it hunts if caught is given
+        alive -- whether every agent survives the tick
+
+    Keyword Arguments:
+        caught -- whether every agent catches the rabbit of each candidate (default: {None} for agents that do not hunt)
+
+    Returns:
+        flat index of the cell where each agent ends the tick and whether it left a newborn behind
+    """
+    own = home[:, None] & (candidates == index[:, None])
+    target = np.empty_like(index)
+    born = np.empty(len(index), dtype=bool)
+    for start, stop in zip((0, *passes[:-1]), passes):
+        agents = slice(start, stop)
+        target[agents], born[agents] = _resolve(
+            flat, index[agents], candidates[agents], keys[agents], value, own[agents], breed[agents],
+            alive[agents], None if caught is None else caught[agents])
+    return target, born
+
+
+def _move_foxes(flat: np.ndarray, index: np.ndarray, topology: Topology, rngs: list[np.random.Generator],
+                breeding_foxes: float, mortality_foxes: float, effectiveness_foxes: float) -> np.ndarray:
+    """Move, hunt, breed and kill the foxes of a stack of worlds
+
+    Arguments:
+        flat -- flattened world matrices, updated in place
+        index -- flat indices of the foxes, in row-major order
+        topology -- topology of the worlds
+        rngs -- random generator of every world
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Returns:
+        flat indices of the foxes after the move, not sorted
+    """
+    order, passes = _passes(index, topology)
+    index = index[order]
+    k = len(topology)
+    # Every random number of the tick in one draw: keys, unchecked move, catches, breeding and death
+    draws = _random(rngs, index // topology.area, 2*k + 3)
+    keys = draws[:, :k]
+    candidates = _candidates(index, topology, draws[:, k], keys)
+    caught = draws[:, k + 1:2*k + 1] < effectiveness_foxes
+    new_born = draws[:, -2] < breeding_foxes
+    alive = draws[:, -1] > mortality_foxes
+    home = np.ones(len(index), dtype=bool)
+    target, born = _choose_targets(flat, index, passes, candidates, keys, FOX, home, new_born, alive, caught)
+    return np.concatenate((target[alive], index[born]))
+
+
+def _move_rabbits(flat: np.ndarray, index: np.ndarray, topology: Topology, rngs: list[np.random.Generator],
+                  breeding_rabbits: float) -> np.ndarray:
+    """Move and breed the rabbits of a stack of worlds
+
+    Arguments:
+        flat -- flattened world matrices, updated in place
+        index -- flat indices of the rabbits, in row-major order
+        topology -- topology of the worlds
+        rngs -- random generator of every world
+        breeding_rabbits -- breeding rate of rabbits
+
+    Returns:
+        flat indices of the rabbits after the move, not sorted
+    """
+    order, passes = _passes(index, topology)
+    index = index[order]
+    k = len(topology)
+    # Every random number of the tick in one draw: keys, unchecked move and breeding
+    draws = _random(rngs, index // topology.area, k + 2)
+    keys = draws[:, :k]
+    candidates = _candidates(index, topology, draws[:, k], keys)
+    new_born = draws[:, -1] <= breeding_rabbits
+    alive = np.ones(len(index), dtype=bool)
+    # As in step_loop, the newborn is left before the move and takes the cell, so the rabbit cannot come back to it
+    target, born = _choose_targets(flat, index, passes, candidates, keys, RABBIT, ~new_born, new_born, alive)
+    return np.concatenate((target, index[born]))
+
+
+def step_ensemble(worlds: np.ndarray, breeding_rabbits: float, breeding_foxes: float,
+                  mortality_foxes: float, effectiveness_foxes: float,
+                  rngs: list[np.random.Generator], topology: Topology | None = None) -> None:
+    """Advance a stack of independent worlds by one tick with the rules of step_vectorized
+
+    All the agents of all the worlds move in the same array operations. Every world draws its
+    random numbers from its own generator, in the same order as step_vectorized, so a world
+    of the stack evolves exactly as it would alone with the same generator.
+
+    Arguments:
+        worlds -- world matrices of shape (number of worlds, size, size), updated in place
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+        rngs -- random generator of every world
+
+    Keyword Arguments:
+        topology -- topology of the worlds (default: {None} for clamped Moore worlds)
+    """
+    if topology is None:
+        topology = get_topology(worlds.shape[1])
+    flat = worlds.reshape(-1)
+
+    index = np.flatnonzero(flat == FOX)
+    if len(index):
+        _move_foxes(flat, index, topology, rngs, breeding_foxes, mortality_foxes, effectiveness_foxes)
+
+    index = np.flatnonzero(flat == RABBIT)
+    if len(index):
+        _move_rabbits(flat, index, topology, rngs, breeding_rabbits)
+
+
+def step_vectorized(matrix_sim: np.ndarray, breeding_rabbits: float, breeding_foxes: float,
+                    mortality_foxes: float, effectiveness_foxes: float,
+                    rng: np.random.Generator | None = None, topology: Topology | None = None) -> None:
+    """Advance the world by one tick, moving all the agents of a species at once
+
+    The rules are those of step_loop. Foxes move first, then rabbits. Every agent makes an unchecked
+    move to a random neighbour, then tries the cells around it in a random order, the first from
+    where the unchecked move landed and the others from its own cell: a fox accepts an empty cell
+    or a rabbit it catches with probability effectiveness_foxes, a rabbit accepts an empty cell.
+    A fox that catches a rabbit leaves a newborn fox behind with probability breeding_foxes,
+    a rabbit that moves leaves a newborn rabbit behind with probability breeding_rabbits,
+    and every fox dies with probability mortality_foxes.
+
+    The agents of a species move in sixteen passes by their row and column instead of one at a time,
+    see _choose_targets, so the run is statistically equal to step_loop, not identical.
+    benchmarks/check_parity.py compares the two engines over a grid of rates and topologies.
+
+    Arguments:
+        matrix_sim -- world matrix, updated in place
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Keyword Arguments:
+        rng -- random generator (default: {None} for a fresh unseeded generator)
+        topology -- topology of the world (default: {None} for a clamped Moore world)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    step_ensemble(matrix_sim[np.newaxis], breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes,
+                  [rng], topology)
+
+
+class AgentIndex:
+    """
+    Class to hold the sorted flat indices of the foxes and rabbits of a world
+    """
+
+    __slots__ = ('foxes', 'rabbits')
+
+    def __init__(self, matrix_sim: np.ndarray) -> None:
+        """Find the agents of a world
+
+        Arguments:
+            matrix_sim -- world matrix
+        """
+        flat = matrix_sim.reshape(-1)
+        self.foxes = np.flatnonzero(flat == FOX)
+        self.rabbits = np.flatnonzero(flat == RABBIT)
+
+    def __len__(self) -> int:
+        return len(self.foxes) + len(self.rabbits)
+
+    def population(self, area: int) -> tuple[float, float]:
+        """Count the rabbits and foxes without looking at the world
+
+        Arguments:
+            area -- number of cells of the world
+
+        Returns:
+            rabbit and fox population as a percentage of the world area
+        """
+        return (len(self.rabbits)/area)*100, (len(self.foxes)/area)*100
+
+
+def step_sparse(matrix_sim: np.ndarray, agents: AgentIndex, breeding_rabbits: float, breeding_foxes: float,
+                mortality_foxes: float, effectiveness_foxes: float,
+                rng: np.random.Generator | None = None, topology: Topology | None = None) -> None:
+    """Advance the world by one tick with the rules of step_vectorized, from the lists of agents
+
+    The world matrix is only used to look up the neighbours of the agents, so the cost of a tick
+    grows with the number of agents instead of the area of the world. The agents are kept in
+    row-major order, so the result is the same as step_vectorized with the same generator.
+
+    Arguments:
+        matrix_sim -- world matrix, updated in place
+        agents -- agents of the world, updated in place
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Keyword Arguments:
+        rng -- random generator (default: {None} for a fresh unseeded generator)
+        topology -- topology of the world (default: {None} for a clamped Moore world)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if topology is None:
+        topology = get_topology(matrix_sim.shape[0])
+    flat = matrix_sim.reshape(-1)
+
+    if len(agents.foxes):
+        agents.foxes = np.sort(_move_foxes(flat, agents.foxes, topology, [rng],
+                                           breeding_foxes, mortality_foxes, effectiveness_foxes))
+        # Drop the rabbits that were eaten
+        agents.rabbits = agents.rabbits[flat[agents.rabbits] == RABBIT]
+
+    if len(agents.rabbits):
+        agents.rabbits = np.sort(_move_rabbits(flat, agents.rabbits, topology, [rng], breeding_rabbits))
+
+
+ENGINES = {
+    'loop': step_loop,
+    'vectorized': step_vectorized,
+}
+if HAVE_NUMBA:
+    ENGINES['numba'] = step_numba
+
+# Engine used in place of an optional engine whose dependency is not installed
+_FALLBACKS = {'numba': 'loop'}
+
+
+def get_engine(name: str):
+    """Get the step function of an engine
+
+    When the dependency of an optional engine is not installed, a warning is issued
+    and the engine it falls back to is returned instead.
+
+    Arguments:
+        name -- name of the engine
+
+    Returns:
+        step function of the engine
+    """
+    if name not in ENGINES and name in _FALLBACKS:
+        warnings.warn(f"Engine {name!r} is not available, falling back to {_FALLBACKS[name]!r}", RuntimeWarning,
+                      stacklevel=2)
+        name = _FALLBACKS[name]
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r}, expected one of {list(ENGINES) + list(_FALLBACKS)}")
+    return ENGINES[name]
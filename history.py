@@ -0,0 +1,80 @@
+"""
+This module contains the population history shown by the charts of the application.
+
+The history keeps the last values in a fixed-capacity ring buffer. Every value is written twice,
+at its slot and one capacity further, so the window in chronological order is always a contiguous
+view of the buffer and appending never copies or reallocates.
+"""
+
+import numpy as np
+
+
+class PopulationHistory:
+    """
+    Class to hold the last rabbit and fox populations of a simulation
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        """Create an empty history
+
+        Keyword Arguments:
+            capacity -- number of values kept (default: {100})
+        """
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity, 2))
+        self.start = 0
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, rabbit_number: float, fox_number: float) -> None:
+        """Add the populations of a tick, dropping the oldest values when the history is full
+
+        Arguments:
+            rabbit_number -- rabbit population in percent
+            fox_number -- fox population in percent
+        """
+        if self.length < self.capacity:
+            slot = self.length
+            self.length += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.data[slot] = self.data[slot + self.capacity] = rabbit_number, fox_number
+
+    def replace(self, values: np.ndarray) -> None:
+        """Replace the content of the history
+
+        Arguments:
+            values -- rabbit and fox populations in chronological order, of shape (n, 2),
+                      only the last capacity values are kept
+        """
+        values = values[len(values) - min(len(values), self.capacity):]
+        self.data[:len(values)] = self.data[self.capacity:self.capacity + len(values)] = values
+        self.start = 0
+        self.length = len(values)
+
+    def clear(self) -> None:
+        """Remove all the values
+        """
+        self.start = 0
+        self.length = 0
+
+    @property
+    def window(self) -> np.ndarray:
+        """Values in chronological order, a view of shape (len(self), 2) with rabbits then foxes
+        """
+        return self.data[self.start:self.start + self.length]
+
+    @property
+    def rabbit(self) -> np.ndarray:
+        """Rabbit populations in chronological order
+        """
+        return self.window[:, 0]
+
+    @property
+    def fox(self) -> np.ndarray:
+        """Fox populations in chronological order
+        """
+        return self.window[:, 1]
@@ -0,0 +1,167 @@
+"""
+This module contains the mean-field Lotka-Volterra model of the simulation.
+
+If the animals were well mixed instead of living on a grid, the fractions R of rabbits and F of
+foxes would follow Lotka-Volterra equations, with time in ticks:
+
+    dR/dt = alpha R (1 - kappa (R + F)^k) - (1 - gamma) C F
+    dF/dt = delta C F - gamma F
+
+The coefficients come from the parameters of the sliders. A fox tries up to k neighbours
+(8 for Moore, 4 for von Neumann) and stops at the first empty cell or at the first rabbit it
+catches, which it does with probability epsilon = effectiveness_foxes. Every other try, on
+a rabbit it misses or on a fox, goes on with q = (1 - epsilon) R + F, so a fox catches
+
+    C = epsilon R (1 + q + ... + q^(k-1))
+
+rabbits per tick, never more than one. Every catch breeds a fox with probability
+delta = breeding_foxes, foxes die at the rate gamma = mortality_foxes, and a fox that dies in
+the tick leaves its prey alive. Rabbits breed at the rate alpha = breeding_rabbits, but only when
+one of their k tries finds an empty cell, so with crowding kappa = 1; without it kappa = 0.
+
+The equations are integrated with an adaptive Dormand-Prince (RK45) solver written with array
+operations, where every parameter set has its own step size, so thousands of sets are solved in
+one call. The grid keeps predators and prey apart, so the mean field follows the first ticks of
+a run but settles at lower populations than the grid; it gives an instant estimate of the
+dynamics, not a replacement for the agent-based runs.
+"""
+
+import numpy as np
+
+
+# Dormand-Prince 5(4) tableau, the equations do not depend on time so the nodes are not needed
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+_E = _B - np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+def coefficients(breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes,
+                 neighbours: int = 8, crowding: bool = True) -> np.ndarray:
+    """Mean-field coefficients of the parameters of the simulation
+
+    Every parameter may be a number or an array, the arrays are broadcast together.
+
+    Arguments:
+        breeding_rabbits -- breeding rate of rabbits
+        breeding_foxes -- breeding rate of foxes
+        mortality_foxes -- mortality rate of foxes
+        effectiveness_foxes -- effectiveness of foxes
+
+    Keyword Arguments:
+        neighbours -- number of neighbours of a cell (default: {8})
+        crowding -- limit the breeding of rabbits to the empty cells (default: {True})
+
+    Returns:
+        alpha, epsilon, gamma, delta, k and kappa along the last axis
+    """
+    breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes)))
+    k = np.full_like(breeding_rabbits, neighbours)
+    kappa = np.full_like(breeding_rabbits, float(crowding))
+    return np.stack([breeding_rabbits, effectiveness_foxes, mortality_foxes, breeding_foxes, k, kappa], axis=-1)
+
+
+def derivative(y: np.ndarray, coefficient: np.ndarray) -> np.ndarray:
+    """Right-hand side of the mean-field equations
+
+    Arguments:
+        y -- fractions of rabbits and foxes, of shape (n, 2)
+        coefficient -- alpha, epsilon, gamma, delta, k and kappa, of shape (n, 6)
+
+    Returns:
+        time derivative of y
+    """
+    rabbit, fox = y[:, 0], y[:, 1]
+    alpha, epsilon, gamma, delta, k, kappa = coefficient.T
+    # A fox goes on searching with probability q, so its catches are a geometric sum over its k tries
+    q = (1 - epsilon) * rabbit + fox
+    tries = np.divide(1 - q ** k, 1 - q, out=k.copy(), where=q < 1)
+    predation = epsilon * rabbit * tries * fox
+    return np.stack([alpha * rabbit * (1 - kappa * (rabbit + fox) ** k) - (1 - gamma) * predation,
+                     delta * predation - gamma * fox], axis=1)
+
+
+def solve(populations: np.ndarray, coefficient: np.ndarray, ticks: int, rtol: float = 1e-6,
+          atol: float = 1e-9) -> np.ndarray:
+    """Integrate the Lotka-Volterra equations of many parameter sets at once
+
+    Steps may span several ticks, the ticks inside a step are interpolated with the cubic
+    Hermite polynomial of its ends.
+
+    Arguments:
+        populations -- initial rabbit and fox population in percent, of shape (n, 2) or (2,)
+        coefficient -- alpha, epsilon, gamma, delta, k and kappa, of shape (n, 6) or (6,), see coefficients
+        ticks -- number of ticks of the result
+
+    Keyword Arguments:
+        rtol -- relative tolerance of a step (default: {1e-6})
+        atol -- absolute tolerance of a step, in fraction of the world (default: {1e-9})
+
+    Returns:
+        rabbit and fox population in percent at ticks 0 to ticks - 1, of shape (n, ticks, 2),
+        or (ticks, 2) for a single parameter set
+    """
+    if ticks < 1:
+        raise ValueError(f"Cannot solve for {ticks} ticks, expected at least 1")
+    single = np.ndim(populations) == 1 and np.ndim(coefficient) == 1
+    populations, coefficient = np.atleast_2d(populations, coefficient)
+    count = max(len(populations), len(coefficient))
+    y = np.array(np.broadcast_to(populations / 100, (count, 2)))
+    coefficient = np.broadcast_to(coefficient, (count, 6))
+
+    result = np.empty((count, ticks, 2))
+    result[:, 0] = y
+    t = np.zeros(count)
+    h = np.full(count, 0.1)
+    next_tick = np.ones(count, dtype=int)
+    active = np.flatnonzero(next_tick < ticks)
+    stages = np.empty((7, count, 2))
+    while len(active):
+        y_active, rates = y[active], coefficient[active]
+        step = np.minimum(h[active], ticks - 1 - t[active])[:, None]
+        k = stages[:, :len(active)]
+        k[0] = derivative(y_active, rates)
+        for stage in range(1, 7):
+            k[stage] = derivative(y_active + step * np.tensordot(_A[stage], k[:stage], axes=1), rates)
+        # The last stage is evaluated at the new point, so k[6] is its derivative
+        y_new = y_active + step * np.tensordot(_B, k, axes=1)
+        error = step * np.tensordot(_E, k, axes=1)
+        scale = atol + rtol * np.maximum(np.abs(y_active), np.abs(y_new))
+        # A step far too long may overflow the crowding term, it is rejected and shortened the most
+        with np.errstate(over='ignore', invalid='ignore'):
+            norm = np.sqrt(np.mean((error / scale) ** 2, axis=1))
+        norm[np.isnan(norm)] = np.inf
+        with np.errstate(divide='ignore'):
+            h[active] = step[:, 0] * np.clip(0.9 * norm ** -0.2, 0.2, 5)
+
+        accepted = np.flatnonzero(norm <= 1)
+        rows = active[accepted]
+        start, end = t[rows], t[rows] + step[accepted, 0]
+        end[end > ticks - 1 - 1e-9] = ticks - 1
+        while True:
+            inside = np.flatnonzero(next_tick[rows] <= end + 1e-9)
+            if not len(inside):
+                break
+            row, i = rows[inside], accepted[inside]
+            width = (end - start)[inside, None]
+            s = (next_tick[row] - start[inside])[:, None] / width
+            result[row, next_tick[row]] = ((2 * s ** 3 - 3 * s ** 2 + 1) * y_active[i]
+                                           + (s ** 3 - 2 * s ** 2 + s) * width * k[0, i]
+                                           + (3 * s ** 2 - 2 * s ** 3) * y_new[i]
+                                           + (s ** 3 - s ** 2) * width * k[6, i])
+            next_tick[row] += 1
+        y[rows] = y_new[accepted]
+        t[rows] = end
+        active = active[next_tick[active] < ticks]
+    result *= 100
+    return result[0] if single else result
+
@@ -0,0 +1,284 @@
+"""
+This module contains the timing instrumentation of the tick loop.
+
+A TickProfiler keeps one record per tick in a fixed-capacity ring buffer: the wall time of every
+phase of the tick and the number of rabbits and foxes. The model phases are timed by the thread
+that steps the simulation, the drawing phases by the window when it draws the tick, so a tick the
+window skipped has no drawing times. A disabled profiler only costs an attribute lookup per phase,
+so it stays in the tick loop and is turned on at runtime.
+
+Profile a fixed-seed reference run without the window, from the repository root:
+
+    python profiler.py --ticks 200 -o profile.prof
+    python main.py --profile profile.prof
+"""
+
+import argparse
+import contextlib
+import cProfile
+import csv
+import json
+import math
+import os
+import pstats
+import threading
+import time
+
+import numpy as np
+
+# Phases of a tick: counting and stepping run on the thread of the model, taking the latest state,
+# updating the charts and rendering the world run in the window
+PHASES = ('count', 'step', 'take', 'charts', 'render')
+COLUMNS = ('tick', *PHASES, 'rabbits', 'foxes')
+COUNTS = ('tick', 'rabbits', 'foxes')
+
+# Parameters of the reference run of the headless profile
+REFERENCE = {'world_size': 500, 'seed': 0}
+
+_DISABLED = contextlib.nullcontext()
+
+
+class _Phase:
+    """
+    Class to time one phase of the current record, reused for every tick
+    """
+
+    __slots__ = ('profiler', 'column', 'start')
+
+    def __init__(self, profiler: 'TickProfiler', column: int) -> None:
+        self.profiler = profiler
+        self.column = column
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler._add(self.profiler.row, self.column, time.perf_counter() - self.start)
+
+
+class TickProfiler:
+    """
+    Class to record the time of every phase and the populations of the last ticks
+    """
+
+    def __init__(self, capacity: int = 1000, enabled: bool = False) -> None:
+        """Create an empty profiler
+
+        Keyword Arguments:
+            capacity -- number of ticks kept (default: {1000})
+            enabled -- record from the start (default: {False})
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self.data = np.full((capacity, len(COLUMNS)), np.nan)
+        self.row = 0
+        self.length = 0
+        self.lock = threading.Lock()
+        self.phases = {name: _Phase(self, COLUMNS.index(name)) for name in PHASES}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _add(self, row: int, column: int, seconds: float) -> None:
+        """Add a time to a cell of the buffer, which holds nan until the phase first runs
+        """
+        value = self.data[row, column]
+        self.data[row, column] = seconds if math.isnan(value) else value + seconds
+
+    def begin(self, tick: int) -> None:
+        """Start the record of a tick, dropping the oldest record when the buffer is full
+
+        Arguments:
+            tick -- tick of the simulation before it is stepped
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.row = (self.row + 1) % self.capacity if self.length else 0
+            self.length = min(self.length + 1, self.capacity)
+            self.data[self.row] = np.nan
+            self.data[self.row, 0] = tick
+
+    def set_agents(self, rabbits: int, foxes: int) -> None:
+        """Set the number of agents at the start of the current tick
+
+        Arguments:
+            rabbits -- number of rabbits
+            foxes -- number of foxes
+        """
+        if self.enabled:
+            self.data[self.row, -2:] = rabbits, foxes
+
+    def phase(self, name: str):
+        """Time a phase of the current tick
+
+        Arguments:
+            name -- one of PHASES
+
+        Returns:
+            context manager, which does nothing while the profiler is disabled
+        """
+        return self.phases[name] if self.enabled else _DISABLED
+
+    def add(self, tick: int, name: str, seconds: float) -> None:
+        """Add the time of a phase to the record of an earlier tick, if it is still in the buffer
+
+        Arguments:
+            tick -- tick of the record
+            name -- one of PHASES
+            seconds -- wall time of the phase
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            # The window draws one of the last ticks, so the search starts from the newest record
+            for age in range(self.length):
+                row = (self.row - age) % self.capacity
+                if self.data[row, 0] == tick:
+                    self._add(row, COLUMNS.index(name), seconds)
+                    return
+
+    def clear(self) -> None:
+        """Remove all the records
+        """
+        with self.lock:
+            self.row = 0
+            self.length = 0
+
+    @property
+    def records(self) -> np.ndarray:
+        """Copy of the records in chronological order, of shape (len(self), len(COLUMNS))
+
+        The times are in seconds and nan for a phase that did not run during the tick.
+        """
+        with self.lock:
+            start = (self.row + 1) % self.capacity if self.length == self.capacity else 0
+            return np.roll(self.data, -start, axis=0)[:self.length]
+
+    def summary(self, ticks: int = 100) -> dict[str, tuple[float, float]]:
+        """Mean and maximum time of every phase over the last ticks
+
+        Keyword Arguments:
+            ticks -- number of ticks summarized (default: {100})
+
+        Returns:
+            mean and maximum in seconds of every phase, nan for a phase without time
+        """
+        records = self.records[-ticks:]
+        summary = {}
+        for name in PHASES:
+            times = records[:, COLUMNS.index(name)]
+            times = times[~np.isnan(times)]
+            summary[name] = (times.mean(), times.max()) if len(times) else (math.nan, math.nan)
+        return summary
+
+    def to_csv(self, path: str) -> None:
+        """Write the records to a CSV file, with the times in seconds and empty fields for nan
+
+        Arguments:
+            path -- path of the file
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            for record in self.records:
+                writer.writerow(['' if math.isnan(value) else int(value) if name in COUNTS else value
+                                 for name, value in zip(COLUMNS, record)])
+
+    def to_json(self, path: str) -> None:
+        """Write the records to a JSON file, one object per tick with the times in seconds and null for nan
+
+        Arguments:
+            path -- path of the file
+        """
+        records = [{name: None if math.isnan(value) else int(value) if name in COUNTS else value
+                    for name, value in zip(COLUMNS, record)} for record in self.records]
+        with open(path, 'w') as file:
+            json.dump({'phases': PHASES, 'unit': 's', 'records': records}, file)
+
+    def export(self, path: str) -> None:
+        """Write the records as JSON when the path ends with .json, as CSV otherwise
+
+        Arguments:
+            path -- path of the file
+        """
+        if path.endswith('.json'):
+            self.to_json(path)
+        else:
+            self.to_csv(path)
+
+
+def run(simulation, ticks: int, profiler: TickProfiler) -> list[tuple[float, float]]:
+    """Count and advance a simulation tick by tick, as the worker of the application does
+
+    Arguments:
+        simulation -- Simulation to advance
+        ticks -- number of ticks
+        profiler -- profiler of the ticks
+
+    Returns:
+        rabbit and fox population in percent before every tick
+    """
+    area = simulation.matrix_sim.size
+    populations = []
+    for _ in range(ticks):
+        profiler.begin(simulation.tick)
+        with profiler.phase('count'):
+            rabbit, fox = simulation.population()
+        profiler.set_agents(round(rabbit*area/100), round(fox*area/100))
+        populations.append((rabbit, fox))
+        with profiler.phase('step'):
+            simulation.step()
+    return populations
+
+
+def profile(path: str, ticks: int = 200, lines: int = 20, **parameters) -> TickProfiler:
+    """Profile the reference run without the window
+
+    The cProfile statistics are written to path, the per-tick timings next to it as CSV, with the
+    extension of path replaced by .csv, or with _ticks.csv appended to its stem when path already
+    ends in .csv. The most expensive functions are printed.
+
+    Arguments:
+        path -- path of the statistics, readable with pstats or snakeviz
+
+    Keyword Arguments:
+        ticks -- number of ticks of the run (default: {200})
+        lines -- number of functions printed (default: {20})
+        parameters -- keyword arguments of Simulation that differ from REFERENCE
+
+    Returns:
+        profiler with the timings of the run
+    """
+    from simulation import Simulation
+
+    simulation = Simulation(**{**REFERENCE, **parameters})
+    profiler = TickProfiler(ticks, enabled=True)
+    with cProfile.Profile() as cprofile:
+        run(simulation, ticks, profiler)
+    cprofile.dump_stats(path)
+    root, extension = os.path.splitext(path)
+    # The timings must not overwrite the statistics, which pstats reads back below
+    profiler.to_csv(root + ('_ticks.csv' if extension.lower() == '.csv' else '.csv'))
+
+    for name, (mean, maximum) in profiler.summary(ticks).items():
+        if not math.isnan(mean):
+            print(f"{name:>6}: mean {1000*mean:.2f} ms, max {1000*maximum:.2f} ms")
+    pstats.Stats(path).sort_stats('cumulative').print_stats(lines)
+    return profiler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--engine', choices=['vectorized', 'numba', 'loop'], default='vectorized')
+    parser.add_argument('--world-size', type=int, default=REFERENCE['world_size'])
+    parser.add_argument('--seed', type=int, default=REFERENCE['seed'])
+    parser.add_argument('-o', '--output', default='profile.prof')
+    args = parser.parse_args()
+    profile(args.output, args.ticks, engine=args.engine, world_size=args.world_size, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+This module records the full history of a simulation to disk and reads it back.
+
+A trajectory is a directory with:
+
+- frames.bin: every Nth world matrix, packed with 2 bits per cell and compressed by chunks of frames
+- chunks.idx: offset and length in frames.bin of every compressed chunk, as int64 pairs
+- rabbit.f4, fox.f4: population in percent at every tick, as raw float32 columns
+- meta.json: world size, frame interval, chunk length, first tick and number of frames
+
+The recorder packs, compresses and writes on a background thread. An error of that thread, a full disk
+for example, is raised by the next record or by close. The reader memory-maps the population columns
+and decompresses only the chunk of the frame it is asked for.
+
+Record a headless run from the repository root:
+
+    python recorder.py --ticks 100000 --world-size 500 --every 10 -o run
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import zlib
+
+import numpy as np
+
+from simulation import Simulation
+
+
+def pack_frame(matrix_sim: np.ndarray) -> bytes:
+    """Pack a world matrix with 2 bits per cell
+
+    Arguments:
+        matrix_sim -- world matrix with values from 0 to 3
+
+    Returns:
+        packed cells, four per byte
+    """
+    cells = matrix_sim.astype(np.uint8).reshape(-1)
+    cells = np.pad(cells, (0, -len(cells) % 4))
+    return (cells[0::4] | cells[1::4] << 2 | cells[2::4] << 4 | cells[3::4] << 6).tobytes()
+
+
+def unpack_frames(packed: bytes, world_size: int) -> np.ndarray:
+    """Unpack consecutive frames packed by pack_frame
+
+    Arguments:
+        packed -- packed frames
+        world_size -- size of the world
+
+    Returns:
+        world matrices of shape (number of frames, world_size, world_size), as uint8
+    """
+    area = world_size ** 2
+    frame_bytes = -(-area // 4)
+    data = np.frombuffer(packed, dtype=np.uint8).reshape(-1, frame_bytes)
+    cells = np.empty((len(data), frame_bytes * 4), dtype=np.uint8)
+    for shift in range(4):
+        cells[:, shift::4] = (data >> (2 * shift)) & 3
+    return cells[:, :area].reshape(-1, world_size, world_size)
+
+
+class TrajectoryRecorder:
+    """
+    Class to write the history of a simulation to a trajectory directory
+    """
+
+    def __init__(self, path: str, world_size: int, every: int = 1, chunk_frames: int = 16, start_tick: int = 0,
+                 level: int = 1) -> None:
+        """Create the trajectory directory and start the writer thread
+
+        Arguments:
+            path -- trajectory directory, created if needed and overwritten
+            world_size -- size of the world
+
+        Keyword Arguments:
+            every -- number of ticks between two recorded frames (default: {1})
+            chunk_frames -- number of frames compressed together (default: {16})
+            start_tick -- tick of the first record (default: {0})
+            level -- zlib compression level (default: {1})
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.meta = {'world_size': world_size, 'every': every, 'chunk_frames': chunk_frames,
+                     'start_tick': start_tick, 'frames': 0, 'ticks': 0}
+        self.level = level
+        self.files = {name: open(os.path.join(path, name), 'wb')
+                      for name in ('frames.bin', 'chunks.idx', 'rabbit.f4', 'fox.f4')}
+        self.chunk = []
+        self.offset = 0
+        self.queue = queue.Queue(maxsize=256)
+        # Exception that stopped the writer thread, raised again by record and close
+        self.error = None
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> 'TrajectoryRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, tick: int, matrix_sim: np.ndarray, population: tuple[float, float]) -> None:
+        """Record a tick, the populations always and the world matrix every Nth tick
+
+        Only a uint8 copy of the world is made here, the rest happens on the writer thread.
+
+        Arguments:
+            tick -- tick of the simulation, consecutive from start_tick
+            matrix_sim -- world matrix
+            population -- rabbit and fox population in percent
+
+        Raises:
+            Exception -- the error that stopped the writer thread, if any
+        """
+        if self.error is not None:
+            raise self.error
+        frame = None
+        if (tick - self.meta['start_tick']) % self.meta['every'] == 0:
+            frame = matrix_sim.astype(np.uint8)
+        self.queue.put((population, frame))
+
+    def _write(self) -> None:
+        """Pack, compress and write the records, on the writer thread
+
+        An error is kept in self.error, then the records are dropped until close, so record and close
+        never wait on a full queue that nothing empties.
+        """
+        item = ()
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                (rabbit_number, fox_number), frame = item
+                self.files['rabbit.f4'].write(np.float32(rabbit_number).tobytes())
+                self.files['fox.f4'].write(np.float32(fox_number).tobytes())
+                self.meta['ticks'] += 1
+                if frame is not None:
+                    self.chunk.append(pack_frame(frame))
+                    self.meta['frames'] += 1
+                    if len(self.chunk) == self.meta['chunk_frames']:
+                        self._write_chunk()
+            if self.chunk:
+                self._write_chunk()
+        except Exception as error:
+            self.error = error
+            while item is not None:
+                item = self.queue.get()
+
+    def _write_chunk(self) -> None:
+        """Compress the pending frames and append them to frames.bin
+        """
+        data = zlib.compress(b''.join(self.chunk), self.level)
+        self.files['frames.bin'].write(data)
+        self.files['chunks.idx'].write(np.array([self.offset, len(data)], dtype=np.int64).tobytes())
+        self.offset += len(data)
+        self.chunk = []
+
+    def close(self) -> None:
+        """Write the pending records and the metadata, then close the files
+
+        Raises:
+            Exception -- the error that stopped the writer thread, if any, after closing the files
+        """
+        self.queue.put(None)
+        self.thread.join()
+        for file in self.files.values():
+            file.close()
+        if self.error is not None:
+            raise self.error
+        with open(os.path.join(self.path, 'meta.json'), 'w') as file:
+            json.dump(self.meta, file)
+
+
+class TrajectoryReader:
+    """
+    Class to read a trajectory directory without loading it whole
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open a trajectory
+
+        Arguments:
+            path -- trajectory directory written by TrajectoryRecorder
+        """
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as file:
+            self.meta = json.load(file)
+        self.world_size = self.meta['world_size']
+        self.every = self.meta['every']
+        self.start_tick = self.meta['start_tick']
+        self.chunks = np.fromfile(os.path.join(path, 'chunks.idx'), dtype=np.int64).reshape(-1, 2)
+        self.rabbit, self.fox = (np.memmap(os.path.join(path, name), dtype=np.float32, mode='r')
+                                 if self.meta['ticks'] else np.zeros(0, dtype=np.float32)
+                                 for name in ('rabbit.f4', 'fox.f4'))
+        self.frames_file = open(os.path.join(path, 'frames.bin'), 'rb')
+        self.cached_chunk = (None, None)
+
+    def __enter__(self) -> 'TrajectoryReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta['frames']
+
+    @property
+    def frame_ticks(self) -> np.ndarray:
+        """Tick of every recorded frame
+        """
+        return self.start_tick + self.every * np.arange(len(self))
+
+    @property
+    def ticks(self) -> np.ndarray:
+        """Tick of every population record
+        """
+        return self.start_tick + np.arange(self.meta['ticks'])
+
+    def frame(self, tick: int) -> np.ndarray:
+        """World matrix of the last recorded frame at or before a tick
+
+        Arguments:
+            tick -- tick of the simulation
+
+        Returns:
+            world matrix as uint8
+        """
+        index = min((tick - self.start_tick) // self.every, len(self) - 1)
+        if index < 0:
+            raise IndexError(f"No frame recorded at or before tick {tick}")
+        chunk, position = divmod(index, self.meta['chunk_frames'])
+        if self.cached_chunk[0] != chunk:
+            offset, length = self.chunks[chunk]
+            self.frames_file.seek(offset)
+            frames = unpack_frames(zlib.decompress(self.frames_file.read(length)), self.world_size)
+            self.cached_chunk = (chunk, frames)
+        return self.cached_chunk[1][position]
+
+    def close(self) -> None:
+        """Close the frames file
+        """
+        self.frames_file.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record a headless run of the Lotka-Volterra model")
+    parser.add_argument('--ticks', type=int, default=10000)
+    parser.add_argument('--world-size', type=int, default=100)
+    parser.add_argument('--every', type=int, default=1, help="ticks between two recorded frames")
+    parser.add_argument('--chunk-frames', type=int, default=16, help="frames compressed together")
+    parser.add_argument('--engine', default='vectorized')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-o', '--output', default='trajectory')
+    args = parser.parse_args()
+
+    simulation = Simulation(world_size=args.world_size, engine=args.engine, seed=args.seed)
+    with TrajectoryRecorder(args.output, args.world_size, every=args.every, chunk_frames=args.chunk_frames) as recorder:
+        for _ in range(args.ticks):
+            recorder.record(simulation.tick, simulation.matrix_sim, simulation.population())
+            simulation.step()
+
+
+if __name__ == '__main__':
+    main()
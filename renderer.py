@@ -0,0 +1,88 @@
+"""
+This module contains the renderer of the world view.
+
+The world matrix is turned into RGBA pixels with a lookup table built from the colormap of the
+application and written straight into the pixel buffer of the canvas, which is then blitted.
+Matplotlib only draws the empty figure when the canvas is resized, and a new world size only
+changes the pixel maps, so the figure and its canvas are never rebuilt.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.colors import ListedColormap
+
+
+class WorldRenderer:
+    """
+    Class to draw the world matrix on a figure canvas
+    """
+
+    def __init__(self, canvas: FigureCanvasBase, map_colors: ListedColormap, matrix_sim: np.ndarray,
+                 frames: int = 30) -> None:
+        """Create the axes of the world
+
+        Arguments:
+            canvas -- Agg based canvas of an empty figure
+            map_colors -- colormap with one color per cell value
+            matrix_sim -- world matrix
+
+        Keyword Arguments:
+            frames -- number of frames averaged in the frame time (default: {30})
+        """
+        self.canvas = canvas
+        self.palette = (map_colors(np.arange(map_colors.N)) * 255).astype(np.uint8).view(np.uint32)[:, 0]
+        self.ax = canvas.figure.add_axes((0, 0, 1, 1))
+        self.ax.axis('off')
+        self.matrix_sim = matrix_sim
+        self.pixel_maps = None
+        self.frame_times = deque(maxlen=frames)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        """Compute the pixel maps of the new canvas size and draw the world over the figure
+        """
+        self.pixel_maps = None
+        self._draw_world()
+
+    def _draw_world(self) -> None:
+        """Write the pixels of the world into the buffer of the canvas
+        """
+        world_size = self.matrix_sim.shape[0]
+        if self.pixel_maps is None or self.pixel_maps[0] != world_size:
+            height = self.canvas.figure.bbox.height
+            x0, y0, x1, y1 = (int(round(value)) for value in self.ax.bbox.extents)
+            top, bottom = int(round(height)) - y1, int(round(height)) - y0
+            # Nearest cell of every pixel, the first row of the world is drawn at the bottom
+            rows = world_size - 1 - ((np.arange(bottom - top) + 0.5) * world_size / (bottom - top)).astype(np.intp)
+            cols = ((np.arange(x1 - x0) + 0.5) * world_size / (x1 - x0)).astype(np.intp)
+            self.pixel_maps = (world_size, np.s_[top:bottom, x0:x1], rows, cols)
+        _, region, rows, cols = self.pixel_maps
+        # One uint32 per RGBA pixel, so every lookup moves whole pixels
+        buffer = np.asarray(self.canvas.get_renderer().buffer_rgba()).view(np.uint32)[..., 0]
+        buffer[region] = self.palette[self.matrix_sim].take(rows, axis=0).take(cols, axis=1)
+
+    def update(self, matrix_sim: np.ndarray) -> None:
+        """Draw a new state of the world, which may have a new size
+
+        Arguments:
+            matrix_sim -- world matrix
+        """
+        start = time.perf_counter()
+        self.matrix_sim = matrix_sim
+        if self.pixel_maps is None:
+            self.canvas.draw()
+        else:
+            self._draw_world()
+            self.canvas.blit(self.ax.bbox)
+        self.frame_times.append(time.perf_counter() - start)
+
+    @property
+    def frame_time(self) -> float:
+        """Average time to draw a frame, in seconds, over the last frames
+        """
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
@@ -0,0 +1,292 @@
+"""
+This module contains the headless simulation of the Lotka-Volterra model.
+
+The Simulation class owns the world and the parameters set by the sliders of the application,
+and advances the world with one of the step engines. The Ensemble class advances many independent
+worlds of the same size together. Neither imports Qt or matplotlib, so they can run on a server
+or in a batch job.
+"""
+
+import numpy as np
+
+from checkpoint import Checkpoint
+from engine import (EMPTY, FOX, RABBIT, AgentIndex, count_population, get_engine, step_ensemble, step_sparse,
+                    step_vectorized)
+from history import PopulationHistory
+from topology import get_topology
+
+# Occupied fraction of the world under which the vectorized engine switches to lists of agents,
+# and over which it switches back to scanning the whole world
+SPARSE_BELOW = 0.05
+DENSE_ABOVE = 0.10
+
+# Rates of the model, which a fork may change, and keyword arguments of Simulation saved in a checkpoint
+RATES = ('breeding_rabbits', 'breeding_foxes', 'mortality_foxes', 'effectiveness_foxes')
+PARAMETERS = ('world_size', 'initial_rabbit', 'initial_foxes', *RATES, 'engine', 'boundary', 'neighbourhood')
+
+
+def place_agents(matrix_sim: np.ndarray, initial_rabbit: int, initial_foxes: int,
+                 rng: np.random.Generator) -> None:
+    """Fill a world with rabbits and foxes at random cells
+
+    The cells of both species are drawn together without replacement, the first ones get the
+    rabbits and the others the foxes, so the world is written once per animal. The draw itself
+    shuffles a list of every cell unless the animals fill less than about 2% of the world, so
+    at the densities of the sliders the placement grows with the area of the world.
+
+    Arguments:
+        matrix_sim -- world matrix, overwritten in place
+        initial_rabbit -- initial rabbit population in percent
+        initial_foxes -- initial foxes population in percent
+        rng -- random generator
+    """
+    area = matrix_sim.size
+    matrix_sim.fill(EMPTY)
+    rabbit_number = int((initial_rabbit/100) * area)
+    fox_number = int((initial_foxes/100) * area)
+    cells = rng.choice(area, rabbit_number + fox_number, replace=False)
+    flat = matrix_sim.reshape(-1)
+    flat[cells[:rabbit_number]] = RABBIT
+    flat[cells[rabbit_number:]] = FOX
+
+
+class Simulation:
+    """
+    Class to hold the state of a simulation and advance it
+
+    With the vectorized engine, a world with few agents is advanced from lists of its agents,
+    see engine.step_sparse, and a crowded world by scanning the whole matrix.
+    """
+
+    def __init__(self, world_size: int = 100, initial_rabbit: int = 20, initial_foxes: int = 2,
+                 breeding_rabbits: float = 0.04, breeding_foxes: float = 0.8, mortality_foxes: float = 0.15,
+                 effectiveness_foxes: float = 0.7, engine: str = 'vectorized',
+                 seed: int | np.random.SeedSequence | None = None, boundary: str = 'clamped',
+                 neighbourhood: str = 'moore') -> None:
+        """Create a simulation and populate its world
+
+        Keyword Arguments:
+            world_size -- size value for a world of dimension value x value (default: {100})
+            initial_rabbit -- initial rabbit population in percent (default: {20})
+            initial_foxes -- initial foxes population in percent (default: {2})
+            breeding_rabbits -- breeding rate of rabbits (default: {0.04})
+            breeding_foxes -- breeding rate of foxes (default: {0.8})
+            mortality_foxes -- mortality rate of foxes (default: {0.15})
+            effectiveness_foxes -- effectiveness of foxes (default: {0.7})
+            engine -- name of the step engine, see engine.get_engine (default: {'vectorized'})
+            seed -- seed of the random generator (default: {None} for an unseeded run)
+            boundary -- edges of the world, 'clamped' or 'toroidal', see topology.py (default: {'clamped'})
+            neighbourhood -- neighbours of a cell, 'moore' or 'von_neumann' (default: {'moore'})
+        """
+        get_engine(engine)
+        get_topology(world_size, boundary, neighbourhood)
+        self.world_size = world_size
+        self.initial_rabbit = initial_rabbit
+        self.initial_foxes = initial_foxes
+        self.breeding_rabbits = breeding_rabbits
+        self.breeding_foxes = breeding_foxes
+        self.mortality_foxes = mortality_foxes
+        self.effectiveness_foxes = effectiveness_foxes
+        self.engine = engine
+        self.boundary = boundary
+        self.neighbourhood = neighbourhood
+        self.rng = np.random.default_rng(seed)
+        self.populate()
+
+    def populate(self) -> None:
+        """Create a new world with the initial populations and reset the tick counter
+        """
+        self.tick = 0
+        self.matrix_sim = np.zeros((self.world_size, self.world_size), dtype=int)
+        place_agents(self.matrix_sim, self.initial_rabbit, self.initial_foxes, self.rng)
+        self.agents = None
+        self._update_representation()
+
+    def _update_representation(self) -> None:
+        """Switch between the dense and the sparse representation according to the occupancy
+        """
+        area = self.matrix_sim.size
+        if self.agents is None:
+            if np.count_nonzero(self.matrix_sim) < SPARSE_BELOW * area:
+                self.agents = AgentIndex(self.matrix_sim)
+        elif len(self.agents) > DENSE_ABOVE * area:
+            self.agents = None
+
+    @property
+    def representation(self) -> str:
+        """'sparse' when the agents are kept in lists, 'dense' otherwise
+        """
+        return 'dense' if self.agents is None else 'sparse'
+
+    def population(self) -> tuple[float, float]:
+        """Count the rabbits and foxes of the world
+
+        Returns:
+            rabbit and fox population as a percentage of the world area
+        """
+        if self.agents is not None:
+            return self.agents.population(self.matrix_sim.size)
+        return count_population(self.matrix_sim)
+
+    def step(self, n: int = 1) -> None:
+        """Advance the simulation
+
+        Keyword Arguments:
+            n -- number of ticks (default: {1})
+        """
+        step = get_engine(self.engine)
+        topology = get_topology(self.matrix_sim.shape[0], self.boundary, self.neighbourhood)
+        if step is not step_vectorized:
+            self.agents = None
+        for _ in range(n):
+            if step is step_vectorized and self.agents is not None:
+                step_sparse(self.matrix_sim, self.agents, self.breeding_rabbits, self.breeding_foxes,
+                            self.mortality_foxes, self.effectiveness_foxes, rng=self.rng, topology=topology)
+            else:
+                step(self.matrix_sim, self.breeding_rabbits, self.breeding_foxes,
+                     self.mortality_foxes, self.effectiveness_foxes, rng=self.rng, topology=topology)
+            if step is step_vectorized:
+                self._update_representation()
+            self.tick += 1
+
+    def checkpoint(self, history: PopulationHistory | None = None) -> Checkpoint:
+        """Take a snapshot of the complete state of the simulation
+
+        Keyword Arguments:
+            history -- population history of the charts saved with the simulation (default: {None})
+
+        Returns:
+            checkpoint from which the run resumes bit for bit, see restore and fork
+        """
+        saved_history = None if history is None else (history.capacity, history.window.copy())
+        return Checkpoint({name: getattr(self, name) for name in PARAMETERS}, self.tick,
+                          self.rng.bit_generator.state, self.matrix_sim.astype(np.uint8),
+                          self.agents is not None, saved_history)
+
+    def restore(self, checkpoint: Checkpoint, history: PopulationHistory | None = None) -> None:
+        """Return to the state of a checkpoint
+
+        Arguments:
+            checkpoint -- checkpoint of any simulation
+
+        Keyword Arguments:
+            history -- population history replaced by the one of the checkpoint, if it has one (default: {None})
+        """
+        get_engine(checkpoint.parameters['engine'])
+        for name in PARAMETERS:
+            setattr(self, name, checkpoint.parameters[name])
+        self.tick = checkpoint.tick
+        self.rng = np.random.Generator(getattr(np.random, checkpoint.rng_state['bit_generator'])())
+        self.rng.bit_generator.state = checkpoint.rng_state
+        self.matrix_sim = checkpoint.matrix_sim.astype(int)
+        self.agents = AgentIndex(self.matrix_sim) if checkpoint.sparse else None
+        if history is not None and checkpoint.history is not None:
+            history.replace(checkpoint.history[1])
+
+    @classmethod
+    def fork(cls, checkpoint: Checkpoint, seed: int | np.random.SeedSequence | None = None,
+             **parameters) -> 'Simulation':
+        """Create a new simulation from a checkpoint, without populating a world first
+
+        Arguments:
+            checkpoint -- checkpoint to start from
+
+        Keyword Arguments:
+            seed -- seed of a new random stream for the branch (default: {None} to continue the stream of the checkpoint)
+            parameters -- rates that differ from the checkpoint, for example breeding_foxes=0.5
+
+        Returns:
+            simulation at the tick of the checkpoint
+        """
+        simulation = cls.__new__(cls)
+        simulation.restore(checkpoint)
+        if seed is not None:
+            simulation.rng = np.random.default_rng(seed)
+        for name, value in parameters.items():
+            if name not in RATES:
+                raise ValueError(f"Only the rates can change in a fork, got {name!r}")
+            setattr(simulation, name, value)
+        return simulation
+
+
+class Ensemble:
+    """
+    Class to advance many independent worlds of the same size and parameters in one stacked array
+    """
+
+    def __init__(self, seeds: list[int | np.random.SeedSequence], world_size: int = 50, initial_rabbit: int = 20,
+                 initial_foxes: int = 2, breeding_rabbits: float = 0.04, breeding_foxes: float = 0.8,
+                 mortality_foxes: float = 0.15, effectiveness_foxes: float = 0.7, boundary: str = 'clamped',
+                 neighbourhood: str = 'moore') -> None:
+        """Create the worlds and populate them
+
+        Arguments:
+            seeds -- seed of every world, a world evolves as a vectorized Simulation with the same seed
+
+        Keyword Arguments:
+            world_size -- size value for worlds of dimension value x value (default: {50})
+            initial_rabbit -- initial rabbit population in percent (default: {20})
+            initial_foxes -- initial foxes population in percent (default: {2})
+            breeding_rabbits -- breeding rate of rabbits (default: {0.04})
+            breeding_foxes -- breeding rate of foxes (default: {0.8})
+            mortality_foxes -- mortality rate of foxes (default: {0.15})
+            effectiveness_foxes -- effectiveness of foxes (default: {0.7})
+            boundary -- edges of the worlds, 'clamped' or 'toroidal', see topology.py (default: {'clamped'})
+            neighbourhood -- neighbours of a cell, 'moore' or 'von_neumann' (default: {'moore'})
+        """
+        if not len(seeds):
+            raise ValueError("Cannot create an ensemble without worlds, expected at least one seed")
+        self.topology = get_topology(world_size, boundary, neighbourhood)
+        self.world_size = world_size
+        self.initial_rabbit = initial_rabbit
+        self.initial_foxes = initial_foxes
+        self.breeding_rabbits = breeding_rabbits
+        self.breeding_foxes = breeding_foxes
+        self.mortality_foxes = mortality_foxes
+        self.effectiveness_foxes = effectiveness_foxes
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self.populate()
+
+    def populate(self) -> None:
+        """Create new worlds with the initial populations and reset the tick counter
+        """
+        self.tick = 0
+        self.worlds = np.zeros((len(self.rngs), self.world_size, self.world_size), dtype=int)
+        for matrix_sim, rng in zip(self.worlds, self.rngs):
+            place_agents(matrix_sim, self.initial_rabbit, self.initial_foxes, rng)
+
+    def population(self) -> np.ndarray:
+        """Count the rabbits and foxes of every world
+
+        Returns:
+            rabbit and fox population as a percentage of the world area, of shape (number of worlds, 2)
+        """
+        flat = self.worlds.reshape(len(self.worlds), -1)
+        counts = np.stack([np.count_nonzero(flat == RABBIT, axis=1), np.count_nonzero(flat == FOX, axis=1)], axis=1)
+        return (counts / self.world_size ** 2) * 100
+
+    def step(self, n: int = 1) -> None:
+        """Advance all the worlds
+
+        Keyword Arguments:
+            n -- number of ticks (default: {1})
+        """
+        for _ in range(n):
+            step_ensemble(self.worlds, self.breeding_rabbits, self.breeding_foxes,
+                          self.mortality_foxes, self.effectiveness_foxes, self.rngs, self.topology)
+            self.tick += 1
+
+    def run(self, ticks: int) -> np.ndarray:
+        """Advance all the worlds and record their populations before every tick
+
+        Arguments:
+            ticks -- number of ticks
+
+        Returns:
+            rabbit and fox population in percent, C-contiguous of shape (number of worlds, ticks, 2)
+        """
+        populations = np.empty((len(self.worlds), ticks, 2))
+        for tick in range(ticks):
+            populations[:, tick] = self.population()
+            self.step()
+        return populations
@@ -0,0 +1,246 @@
+"""
+This module runs parameter sweeps of the Lotka-Volterra model.
+
+Every point of a parameter grid or of a Latin hypercube sample is run several times with headless
+simulations spread over a process pool. Each run gets its own random stream spawned from one seed,
+and its summary statistics are written to a CSV file as soon as it finishes.
+
+Run from the repository root, for example:
+
+    python sweep.py --grid breeding_foxes=0.4,0.6,0.8 --grid mortality_foxes=0.05:0.25:5 --replicates 4 -o sweep.csv
+    python sweep.py --lhs 200 --bounds breeding_rabbits=0.01:0.1 --bounds effectiveness_foxes=0.3:1 -o lhs.csv
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from simulation import Simulation
+from topology import BOUNDARIES, NEIGHBOURHOODS
+
+# Parameters of the model that can be swept, as set by the sliders of the application
+PARAMETERS = ('breeding_rabbits', 'breeding_foxes', 'mortality_foxes', 'effectiveness_foxes')
+
+STATISTICS = ('ticks', 'extinction_rabbit', 'extinction_fox', 'period_rabbit', 'period_fox',
+              'mean_rabbit', 'var_rabbit', 'mean_fox', 'var_fox')
+
+
+def grid_points(grids: dict[str, list[float]]) -> list[dict[str, float]]:
+    """Every combination of the values of a parameter grid
+
+    Arguments:
+        grids -- values of every swept parameter
+
+    Returns:
+        list of parameter sets
+    """
+    names = list(grids)
+    return [dict(zip(names, values)) for values in itertools.product(*grids.values())]
+
+
+def latin_hypercube(bounds: dict[str, tuple[float, float]], samples: int,
+                    rng: np.random.Generator) -> list[dict[str, float]]:
+    """Latin hypercube sample of the parameter space
+
+    Every parameter range is split in as many strata as samples, and every stratum is used once.
+
+    Arguments:
+        bounds -- lower and upper bound of every swept parameter
+        samples -- number of parameter sets
+        rng -- random generator
+
+    Returns:
+        list of parameter sets
+    """
+    points = [{} for _ in range(samples)]
+    for name, (low, high) in bounds.items():
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        for point, value in zip(points, low + strata * (high - low)):
+            point[name] = float(value)
+    return points
+
+
+def oscillation_period(series: np.ndarray) -> float:
+    """Dominant period of a population series, from its autocorrelation
+
+    Arguments:
+        series -- population at every tick
+
+    Returns:
+        lag in ticks of the first autocorrelation peak after the first zero crossing,
+        nan when the series does not oscillate
+    """
+    centered = series - series.mean()
+    if len(centered) < 4 or not centered.any():
+        return np.nan
+    spectrum = np.fft.rfft(centered, 2 * len(centered))
+    autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum))[:len(centered)]
+    negative = np.flatnonzero(autocorrelation < 0)
+    if not len(negative):
+        return np.nan
+    tail = autocorrelation[negative[0]:]
+    peaks = np.flatnonzero((tail[1:-1] > tail[:-2]) & (tail[1:-1] >= tail[2:]) & (tail[1:-1] > 0))
+    if not len(peaks):
+        return np.nan
+    return float(negative[0] + peaks[0] + 1)
+
+
+def summarize(populations: np.ndarray) -> dict[str, float]:
+    """Summary statistics of a run
+
+    Arguments:
+        populations -- rabbit and fox population in percent at every tick, of shape (ticks, 2)
+
+    Returns:
+        number of ticks, first tick without rabbits and without foxes (-1 if never),
+        oscillation period, mean and variance of both populations
+    """
+    summary = {'ticks': len(populations)}
+    for column, species in enumerate(['rabbit', 'fox']):
+        series = populations[:, column]
+        extinct = np.flatnonzero(series == 0)
+        summary[f'extinction_{species}'] = int(extinct[0]) if len(extinct) else -1
+        summary[f'period_{species}'] = oscillation_period(series)
+        summary[f'mean_{species}'] = float(series.mean())
+        summary[f'var_{species}'] = float(series.var())
+    return summary
+
+
+def run(task: tuple) -> dict:
+    """Run one simulation of the sweep
+
+    The run stops early when both species are extinct.
+
+    Arguments:
+        task -- run index, replicate index, parameter set, seed and keyword arguments of Simulation
+
+    Returns:
+        row of the result file
+    """
+    index, replicate, parameters, seed, options = task
+    ticks = options.pop('ticks')
+    simulation = Simulation(**options, **parameters, seed=seed)
+    populations = np.zeros((ticks, 2))
+    for tick in range(ticks):
+        populations[tick] = simulation.population()
+        if not populations[tick].any():
+            populations = populations[:tick + 1]
+            break
+        simulation.step()
+    return {'run': index, 'replicate': replicate, **parameters, **summarize(populations)}
+
+
+def sweep(points: list[dict[str, float]], output: str, replicates: int = 1, processes: int | None = None,
+          seed: int | None = None, **options) -> float:
+    """Run every parameter set several times and stream the summaries to a CSV file
+
+    Arguments:
+        points -- parameter sets
+        output -- path of the CSV file
+
+    Keyword Arguments:
+        replicates -- number of runs of every parameter set (default: {1})
+        processes -- number of worker processes (default: {None} for every core)
+        seed -- seed from which the random stream of every run is spawned (default: {None})
+        options -- ticks and keyword arguments of Simulation shared by every run
+
+    Returns:
+        throughput in runs per minute
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(points) * replicates)
+    tasks = [(index, replicate, point, seeds[index], dict(options))
+             for index, (point, replicate) in enumerate(itertools.product(points, range(replicates)))]
+    # Columns of the swept parameters, in the order of PARAMETERS, so an empty sample still gets a header
+    swept = [name for name in PARAMETERS if any(name in point for point in points)]
+    fields = ['run', 'replicate', *swept, *STATISTICS]
+
+    start = time.perf_counter()
+    with open(output, 'w', newline='') as file, multiprocessing.Pool(processes) as pool:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for row in pool.imap_unordered(run, tasks):
+            writer.writerow(row)
+            file.flush()
+    return 60 * len(tasks) / (time.perf_counter() - start)
+
+
+def parse_range(text: str) -> list[float]:
+    """Parse the values of a swept parameter
+
+    Arguments:
+        text -- comma separated values, or start:stop:count for evenly spaced values
+
+    Returns:
+        list of values
+    """
+    if ':' in text:
+        start, stop, count = text.split(':')
+        return [float(value) for value in np.linspace(float(start), float(stop), int(count))]
+    return [float(value) for value in text.split(',')]
+
+
+def parse_assignment(text: str) -> tuple[str, str]:
+    """Split a name=value argument and check the name is a swept parameter
+
+    Arguments:
+        text -- argument of the command line
+
+    Returns:
+        name and value
+    """
+    name, _, value = text.partition('=')
+    if name not in PARAMETERS:
+        raise argparse.ArgumentTypeError(f"unknown parameter {name!r}, expected one of {', '.join(PARAMETERS)}")
+    return name, value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parameter sweep of the Lotka-Volterra model")
+    sampling = parser.add_mutually_exclusive_group(required=True)
+    sampling.add_argument('--grid', type=parse_assignment, action='append',
+                          help="name=v1,v2,... or name=start:stop:count, repeat for every swept parameter")
+    sampling.add_argument('--lhs', type=int, metavar='SAMPLES', help="number of Latin hypercube samples")
+    parser.add_argument('--bounds', type=parse_assignment, action='append', default=[],
+                        help="name=low:high, bounds of a parameter of the Latin hypercube")
+    parser.add_argument('--replicates', type=int, default=1)
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--world-size', type=int, default=50)
+    parser.add_argument('--initial-rabbit', type=int, default=20)
+    parser.add_argument('--initial-foxes', type=int, default=2)
+    parser.add_argument('--engine', default='vectorized')
+    parser.add_argument('--boundary', choices=list(BOUNDARIES), default='clamped')
+    parser.add_argument('--neighbourhood', choices=list(NEIGHBOURHOODS), default='moore')
+    parser.add_argument('--processes', type=int, default=None, help="worker processes (default: every core)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-o', '--output', default='sweep.csv')
+    args = parser.parse_args()
+    if args.lhs is not None and args.lhs < 1:
+        parser.error(f"--lhs needs at least 1 sample, got {args.lhs}")
+    if args.replicates < 1:
+        parser.error(f"--replicates needs at least 1 run, got {args.replicates}")
+
+    if args.grid:
+        points = grid_points({name: parse_range(value) for name, value in args.grid})
+    else:
+        if not args.bounds:
+            parser.error("--lhs needs at least one --bounds")
+        bounds = {name: tuple(float(bound) for bound in value.split(':')) for name, value in args.bounds}
+        points = latin_hypercube(bounds, args.lhs, np.random.default_rng(args.seed))
+    if not points:
+        parser.error("the grid has no point, every --grid needs at least one value")
+
+    throughput = sweep(points, args.output, replicates=args.replicates, processes=args.processes, seed=args.seed,
+                       ticks=args.ticks, world_size=args.world_size, initial_rabbit=args.initial_rabbit,
+                       initial_foxes=args.initial_foxes, engine=args.engine, boundary=args.boundary,
+                       neighbourhood=args.neighbourhood)
+    print(f"{len(points) * args.replicates} runs on {args.processes or os.cpu_count()} processes, "
+          f"{throughput:.1f} runs per minute, written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
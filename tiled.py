@@ -0,0 +1,251 @@
+"""
+This module steps very large worlds on several cores.
+
+The world lives in shared memory and is split into an even number of tiles per side. The tiles
+are coloured like a checkerboard with four colours, so two tiles of the same colour never touch,
+not even by a corner. A tick moves the foxes, then the rabbits, one colour after the other: the
+tiles of a colour are stepped at the same time by worker processes with the rules of
+step_vectorized, and every agent of a tile sees the cells of the surrounding tiles, its ghost
+cells, which no other worker writes while the colour runs.
+
+An agent that crosses into a tile of a later colour is written with a moved marker, so it is not
+moved twice in the tick, and a last pass over every tile clears the markers and counts the
+populations. Inside a tile the result is that of step_vectorized; across tiles a cell freed by an
+earlier colour can be taken by a later one, as in step_loop. Every tile draws from its own random
+stream derived from the seed, the tick and the tile, so a run does not depend on the number of
+worker processes.
+
+Run a benchmark from the repository root:
+
+    python -m benchmarks.bench_tiled --world-size 4000 --processes 1 2 4 8
+"""
+
+import math
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engine import FOX, RABBIT, _move_foxes, _move_rabbits
+from simulation import place_agents
+from topology import get_topology
+
+# Agents that already moved during the current tick
+MOVED_FOX = 3
+MOVED_RABBIT = 4
+
+# World of the current process, attached to the shared memory
+_shared = None
+_world = None
+
+
+def _attach(name: str | None, shape: tuple[int, int], world: np.ndarray | None = None) -> None:
+    """Attach the process to the shared world, as the initializer of the workers
+
+    Arguments:
+        name -- name of the shared memory block
+        shape -- shape of the world
+
+    Keyword Arguments:
+        world -- world of the main process, used in place of the shared memory block (default: {None})
+    """
+    global _shared, _world
+    if world is not None:
+        _world = world
+    else:
+        _shared = shared_memory.SharedMemory(name=name)
+        _world = np.ndarray(shape, dtype=np.uint8, buffer=_shared.buf)
+
+
+def _release(shared: shared_memory.SharedMemory, pool) -> None:
+    """Stop the worker processes, then close and remove the shared memory
+
+    Arguments:
+        shared -- shared memory block of the world
+        pool -- pool of the worker processes, None without workers
+    """
+    global _world
+    if pool is not None:
+        pool.close()
+        pool.join()
+    # Without workers this process attached its own world, which is a view of the block
+    _world = None
+    try:
+        shared.close()
+    except BufferError:
+        # A view of the block is still alive, the mapping goes away with it
+        pass
+    shared.unlink()
+
+
+def _step_tile(task: tuple) -> None:
+    """Move the agents of a species that start the tick in a tile
+
+    Arguments:
+        task -- bounds of the tile, species, seed, rates, boundary and neighbourhood
+    """
+    (top, bottom, left, right), value, seed, rates, boundary, neighbourhood = task
+    breeding_rabbits, breeding_foxes, mortality_foxes, effectiveness_foxes = rates
+    world_size = _world.shape[0]
+    local = np.flatnonzero(_world[top:bottom, left:right] == value)
+    if not len(local):
+        return
+    rows, cols = np.divmod(local, right - left)
+    index = (top + rows) * world_size + left + cols
+    topology = get_topology(world_size, boundary, neighbourhood)
+    flat = _world.reshape(-1)
+    rng = np.random.default_rng(seed)
+    if value == FOX:
+        moved = _move_foxes(flat, index, topology, [rng], breeding_foxes, mortality_foxes, effectiveness_foxes)
+        flat[moved] = MOVED_FOX
+    else:
+        moved = _move_rabbits(flat, index, topology, [rng], breeding_rabbits)
+        flat[moved] = MOVED_RABBIT
+
+
+def _finish_tile(bounds: tuple[int, int, int, int]) -> tuple[int, int]:
+    """Clear the moved markers of a tile and count its agents
+
+    Arguments:
+        bounds -- top, bottom, left and right of the tile
+
+    Returns:
+        number of rabbits and foxes of the tile
+    """
+    top, bottom, left, right = bounds
+    region = _world[top:bottom, left:right]
+    foxes = region == MOVED_FOX
+    rabbits = region == MOVED_RABBIT
+    region[foxes] = FOX
+    region[rabbits] = RABBIT
+    return np.count_nonzero(rabbits), np.count_nonzero(foxes)
+
+
+class TiledSimulation:
+    """
+    Class to hold a world in shared memory and advance it on several processes
+    """
+
+    def __init__(self, world_size: int = 4000, processes: int | None = None, tiles: int | None = None,
+                 initial_rabbit: int = 20, initial_foxes: int = 2, breeding_rabbits: float = 0.04,
+                 breeding_foxes: float = 0.8, mortality_foxes: float = 0.15, effectiveness_foxes: float = 0.7,
+                 seed: int | None = None, boundary: str = 'clamped', neighbourhood: str = 'moore') -> None:
+        """Create the shared world, populate it and start the worker processes
+
+        Keyword Arguments:
+            world_size -- size value for a world of dimension value x value (default: {4000})
+            processes -- number of worker processes, 1 steps in this process (default: {None} for every core)
+            tiles -- even number of tiles per side, each at least 4 cells wide
+                     (default: {None} for enough tiles to give every process one tile per colour)
+            initial_rabbit -- initial rabbit population in percent (default: {20})
+            initial_foxes -- initial foxes population in percent (default: {2})
+            breeding_rabbits -- breeding rate of rabbits (default: {0.04})
+            breeding_foxes -- breeding rate of foxes (default: {0.8})
+            mortality_foxes -- mortality rate of foxes (default: {0.15})
+            effectiveness_foxes -- effectiveness of foxes (default: {0.7})
+            seed -- seed of the placement and of the streams of the tiles (default: {None} for an unseeded run)
+            boundary -- edges of the world, 'clamped' or 'toroidal', see topology.py (default: {'clamped'})
+            neighbourhood -- neighbours of a cell, 'moore' or 'von_neumann' (default: {'moore'})
+        """
+        self.processes = processes or multiprocessing.cpu_count()
+        if tiles is None:
+            tiles = min(2 * math.ceil(math.sqrt(self.processes)), world_size // 8 * 2)
+        # An agent moves up to two cells away, so two tiles of a colour never reach the same cell of the tile between them
+        if tiles < 2 or tiles % 2 or world_size < 4 * tiles:
+            raise ValueError(f"Cannot split a world of size {world_size} in {tiles} tiles per side, "
+                             f"expected an even number of tiles at least 4 cells wide")
+        get_topology(world_size, boundary, neighbourhood)
+        self.world_size = world_size
+        self.tiles = tiles
+        self.initial_rabbit = initial_rabbit
+        self.initial_foxes = initial_foxes
+        self.breeding_rabbits = breeding_rabbits
+        self.breeding_foxes = breeding_foxes
+        self.mortality_foxes = mortality_foxes
+        self.effectiveness_foxes = effectiveness_foxes
+        self.boundary = boundary
+        self.neighbourhood = neighbourhood
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+        edges = np.linspace(0, world_size, tiles + 1).astype(int)
+        self.colours = [[(edges[i], edges[i + 1], edges[j], edges[j + 1])
+                         for i in range(row, tiles, 2) for j in range(col, tiles, 2)]
+                        for row in range(2) for col in range(2)]
+
+        shape = (world_size, world_size)
+        # One byte per cell holds every cell value, markers included
+        self.shared = shared_memory.SharedMemory(create=True, size=world_size ** 2 * np.dtype(np.uint8).itemsize)
+        self.matrix_sim = np.ndarray(shape, dtype=np.uint8, buffer=self.shared.buf)
+        if self.processes == 1:
+            self.pool = None
+        else:
+            self.pool = multiprocessing.Pool(self.processes, initializer=_attach, initargs=(self.shared.name, shape))
+        # Release the workers and the shared memory even if close is never called
+        self._finalizer = weakref.finalize(self, _release, self.shared, self.pool)
+        self.populate()
+
+    def __enter__(self) -> 'TiledSimulation':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _map(self, function, tasks: list) -> list:
+        """Run tasks on the worker processes, or in this process without workers
+        """
+        if self.pool is None:
+            _attach(None, self.matrix_sim.shape, self.matrix_sim)
+            return list(map(function, tasks))
+        return self.pool.map(function, tasks)
+
+    def populate(self) -> None:
+        """Fill the world with the initial populations and reset the tick counter
+        """
+        self.tick = 0
+        place_agents(self.matrix_sim, self.initial_rabbit, self.initial_foxes,
+                     np.random.default_rng(self.seed_sequence.spawn(1)[0]))
+        area = self.matrix_sim.size
+        self.populations = ((np.count_nonzero(self.matrix_sim == RABBIT)/area)*100,
+                            (np.count_nonzero(self.matrix_sim == FOX)/area)*100)
+
+    def population(self) -> tuple[float, float]:
+        """Rabbit and fox populations counted at the end of the last tick
+
+        Returns:
+            rabbit and fox population as a percentage of the world area
+        """
+        return self.populations
+
+    def step(self, n: int = 1) -> None:
+        """Advance the world
+
+        Keyword Arguments:
+            n -- number of ticks (default: {1})
+        """
+        rates = (self.breeding_rabbits, self.breeding_foxes, self.mortality_foxes, self.effectiveness_foxes)
+        for _ in range(n):
+            number = 0
+            for value in (FOX, RABBIT):
+                for colour in self.colours:
+                    tasks = []
+                    for bounds in colour:
+                        seed = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(self.tick, number))
+                        tasks.append((bounds, value, seed, rates, self.boundary, self.neighbourhood))
+                        number += 1
+                    self._map(_step_tile, tasks)
+            # Every agent left the tick with a moved marker, so the markers are the populations
+            counts = np.sum(self._map(_finish_tile, [bounds for colour in self.colours for bounds in colour]), axis=0)
+            self.populations = tuple(float(value) for value in (counts / self.matrix_sim.size) * 100)
+            self.tick += 1
+
+    def close(self) -> None:
+        """Stop the worker processes, then close and remove the shared memory
+
+        The world stays readable as a copy in the memory of this process.
+        """
+        if not self._finalizer.alive:
+            return
+        self.matrix_sim = self.matrix_sim.copy()
+        self.pool = None
+        self._finalizer()
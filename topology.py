@@ -0,0 +1,123 @@
+"""
+This module contains the topologies of the world.
+
+A topology says which cells are the neighbours of a cell. The boundary decides what happens at
+the edges of the world: a clamped world repeats its edge cells, so an agent at the edge may stay
+in place, and a toroidal world wraps around, so it has no edges at all. The neighbourhood is the
+eight surrounding cells (Moore) or the four orthogonal ones (von Neumann).
+
+The neighbours are looked up in tables built once per world size and kept in a cache, one table
+for the rows and one for the columns, so the engines never compare direction names or clamp
+coordinates while they move the agents, and the tables grow with the side of the world, not its area.
+"""
+
+import functools
+
+import numpy as np
+
+# Row and column offsets of the eight neighbours, in the order used by step_loop
+DIRECTIONS = {
+    'up_left': (-1, -1), 'up': (-1, 0), 'up_right': (-1, 1),
+    'left': (0, -1), 'right': (0, 1),
+    'down_left': (1, -1), 'down': (1, 0), 'down_right': (1, 1),
+}
+
+BOUNDARIES = ('clamped', 'toroidal')
+
+NEIGHBOURHOODS = {
+    'moore': tuple(DIRECTIONS),
+    'von_neumann': ('up', 'left', 'right', 'down'),
+}
+
+
+class Topology:
+    """
+    Class to hold the neighbour tables of a world size, boundary and neighbourhood
+    """
+
+    def __init__(self, world_size: int, boundary: str = 'clamped', neighbourhood: str = 'moore') -> None:
+        """Build the neighbour tables
+
+        Arguments:
+            world_size -- size of the world
+
+        Keyword Arguments:
+            boundary -- 'clamped' or 'toroidal' (default: {'clamped'})
+            neighbourhood -- 'moore' or 'von_neumann' (default: {'moore'})
+        """
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary {boundary!r}, expected one of {list(BOUNDARIES)}")
+        if neighbourhood not in NEIGHBOURHOODS:
+            raise ValueError(f"Unknown neighbourhood {neighbourhood!r}, expected one of {list(NEIGHBOURHOODS)}")
+        self.world_size = world_size
+        self.area = world_size ** 2
+        self.boundary = boundary
+        self.neighbourhood = neighbourhood
+        self.directions = NEIGHBOURHOODS[neighbourhood]
+        self.offsets = np.array([DIRECTIONS[direction] for direction in self.directions], dtype=np.intp)
+
+        positions = np.arange(world_size, dtype=np.intp)[:, None]
+        if boundary == 'clamped':
+            self.rows = np.clip(positions + self.offsets[:, 0], 0, world_size - 1)
+            self.cols = np.clip(positions + self.offsets[:, 1], 0, world_size - 1)
+        else:
+            self.rows = (positions + self.offsets[:, 0]) % world_size
+            self.cols = (positions + self.offsets[:, 1]) % world_size
+        # Flat index of the first cell of the neighbour row, so a neighbour is one addition away
+        self.row_starts = self.rows * world_size
+        # Flat offset of every neighbour of a cell away from the edges
+        self.flat_offsets = self.offsets[:, 0] * world_size + self.offsets[:, 1]
+        for table in (self.offsets, self.rows, self.cols, self.row_starts, self.flat_offsets):
+            table.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.directions)
+
+    def neighbours(self, index: np.ndarray) -> np.ndarray:
+        """Flat indices of the neighbours of each cell
+
+        Arguments:
+            index -- flat indices of the cells in a stack of worlds of this size
+
+        Returns:
+            array of shape (len(index), len(self)), in the order of self.directions
+        """
+        local = index % self.area
+        rows, cols = np.divmod(local, self.world_size)
+        neighbours = index[:, None] + self.flat_offsets
+        # Only the cells at the edges are clamped or wrapped, the others are one addition away
+        last = self.world_size - 1
+        edge = np.flatnonzero((rows == 0) | (rows == last) | (cols == 0) | (cols == last))
+        neighbours[edge] = (index[edge] - local[edge])[:, None] + self.row_starts[rows[edge]] + self.cols[cols[edge]]
+        return neighbours
+
+    def neighbour(self, index: np.ndarray, direction: np.ndarray) -> np.ndarray:
+        """Flat index of one neighbour of each cell
+
+        Arguments:
+            index -- flat indices of the cells in a stack of worlds of this size
+            direction -- position in self.directions of the neighbour of each cell
+
+        Returns:
+            array of the same shape as index
+        """
+        local = index % self.area
+        rows, cols = np.divmod(local, self.world_size)
+        return index - local + self.row_starts[rows, direction] + self.cols[cols, direction]
+
+
+@functools.lru_cache(maxsize=64)
+def get_topology(world_size: int, boundary: str = 'clamped', neighbourhood: str = 'moore') -> Topology:
+    """Get the topology of a world, built on first use and cached
+
+    Arguments:
+        world_size -- size of the world
+
+    Keyword Arguments:
+        boundary -- 'clamped' or 'toroidal' (default: {'clamped'})
+        neighbourhood -- 'moore' or 'von_neumann' (default: {'moore'})
+
+    Returns:
+        topology with read-only tables
+    """
+    return Topology(world_size, boundary, neighbourhood)
@@ -0,0 +1,651 @@
+"""
+This module contains the main window of the application.
+
+The UI class creates the main window of the application and handles the user interface elements such as labels, sliders, and buttons.
+The class is a view over a Simulation: the sliders update the simulation parameters and the window redraws the world.
+
+The widgets of main.ui are built from Python code that PyQt6 compiles once and caches next to it,
+so the XML is not parsed at every start. The population charts are built on the first pass of the
+event loop, after the window and the world view are shown.
+"""
+
+import importlib.util
+import os
+import time
+from matplotlib.colors import ListedColormap
+import numpy as np
+import PyQt6.QtWidgets as qtw
+from PyQt6 import QtCore, QtGui
+import matplotlib
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from charts import BlitChart
+from checkpoint import Checkpoint
+from history import PopulationHistory
+from meanfield import coefficients, solve
+from renderer import WorldRenderer
+from simulation import Simulation
+from topology import NEIGHBOURHOODS
+from worker import SimulationWorker
+
+matplotlib.rcParams.update({'font.size': 6})
+
+# Definition of the widgets, and the Python code compiled from it
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.ui')
+UI_CACHE = os.path.join(os.path.dirname(UI_FILE), '__pycache__', 'main_ui.py')
+
+# Time between two redraws of the window while the model runs, in milliseconds
+REFRESH_INTERVAL = 16
+
+# Number of ticks summarized by the profiler overlay
+PROFILE_TICKS = 100
+
+# Number of chart windows solved at once when the mean-field overlay runs out of ticks
+FORECAST_WINDOWS = 10
+
+
+def load_ui(window: qtw.QMainWindow) -> None:
+    """Build the widgets of main.ui on a window
+
+    The Python code of main.ui is compiled again when the file is newer than the cache. When the
+    cache cannot be written, the file is parsed with uic.loadUi as before.
+
+    Arguments:
+        window -- main window
+    """
+    try:
+        if not os.path.exists(UI_CACHE) or os.path.getmtime(UI_CACHE) < os.path.getmtime(UI_FILE):
+            from PyQt6 import uic
+
+            os.makedirs(os.path.dirname(UI_CACHE), exist_ok=True)
+            # Written aside and renamed, so an application starting meanwhile never reads half a file
+            temporary = f'{UI_CACHE}.{os.getpid()}'
+            with open(temporary, 'w') as file:
+                uic.compileUi(UI_FILE, file)
+            os.replace(temporary, UI_CACHE)
+    except OSError:
+        from PyQt6 import uic
+
+        uic.loadUi(UI_FILE, window)
+        return
+    spec = importlib.util.spec_from_file_location('main_ui', UI_CACHE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.Ui_MainWindow().setupUi(window)
+
+
+class UI(qtw.QMainWindow):
+    """
+    Class to create the main window of the application
+    """
+
+    def __init__(self, engine: str = 'vectorized', window: int = 100, seed: int | None = None,
+                 checkpoint: str | None = None, boundary: str = 'clamped', neighbourhood: str = 'moore',
+                 mean_field: bool = False) -> None:
+        """Create the main window
+
+        Keyword Arguments:
+            engine -- name of the step engine of the simulation (default: {'vectorized'})
+            window -- number of ticks shown by the population charts (default: {100})
+            seed -- seed of the random generator of the simulation (default: {None} for an unseeded run)
+            checkpoint -- path of a checkpoint to resume (default: {None})
+            boundary -- edges of the world, 'clamped' or 'toroidal' (default: {'clamped'})
+            neighbourhood -- neighbours of a cell, 'moore' or 'von_neumann' (default: {'moore'})
+            mean_field -- overlay the mean-field Lotka-Volterra populations on the charts (default: {False})
+        """
+        super(UI, self).__init__()
+
+        load_ui(self)
+
+        # Define the labels
+        self.world_size_label = self.findChild(qtw.QLabel, "worldSize_label")
+        self.initial_rabbits_label = self.findChild(qtw.QLabel, "initialRabbit_label")
+        self.initial_foxes_label = self.findChild(qtw.QLabel, "initialFox_label")
+        self.breeding_rabbits_label = self.findChild(qtw.QLabel, "breedingRabbit_label")
+        self.breeding_foxes_label = self.findChild(qtw.QLabel, "breedingFox_label")
+        self.mortality_foxes_label = self.findChild(qtw.QLabel, "mortalityFox_label")
+        self.effectiveness_foxes_label = self.findChild(qtw.QLabel, "effectivenessFox_label")
+        self.simulation_speed_label = self.findChild(qtw.QLabel, "simulationSpeed_label")
+
+        # Define the sliders
+        self.world_size_horizontal_slider = self.findChild(qtw.QSlider, "worldSize_horizontalSlider")
+        self.initial_rabbit_horizontal_slider = self.findChild(qtw.QSlider, "initialRabbit_horizontalSlider")
+        self.initial_foxes_horizontal_slider = self.findChild(qtw.QSlider, "initialFoxes_horizontalSlider")
+        self.breeding_rabbits_horizontal_slider = self.findChild(qtw.QSlider, "breedingRabbits_horizontalSlider")
+        self.breeding_foxes_horizontal_slider = self.findChild(qtw.QSlider, "breedingFoxes_horizontalSlider")
+        self.mortality_foxes_horizontal_slider = self.findChild(qtw.QSlider, "mortalityFoxes_horizontalSlider")
+        self.effectiveness_foxes_horizontal_slider = self.findChild(qtw.QSlider, "effectivenessFoxes_horizontalSlider")
+        self.simulation_speed_horizontal_slider = self.findChild(qtw.QSlider, "simulationSpeed_horizontalSlider")
+
+        # Set slider
+        self.world_size_horizontal_slider.setValue(int(int(self.world_size_label.text())/10))
+        self.initial_rabbit_horizontal_slider.setValue(int(self.initial_rabbits_label.text()))
+        self.initial_foxes_horizontal_slider.setValue(int(self.initial_foxes_label.text()))
+        self.breeding_rabbits_horizontal_slider.setValue(int(1000*float(self.breeding_rabbits_label.text())))
+        self.breeding_foxes_horizontal_slider.setValue(int(1000*float(self.breeding_foxes_label.text())))
+        self.mortality_foxes_horizontal_slider.setValue(int(1000*float(self.mortality_foxes_label.text())))
+        self.effectiveness_foxes_horizontal_slider.setValue(int(1000*float(self.effectiveness_foxes_label.text())))
+        self.simulation_speed_horizontal_slider.setValue(int(10*float(self.simulation_speed_label.text())))
+
+        # Move the slider
+        self.world_size_horizontal_slider.valueChanged.connect(self.slide_world_size)
+        self.initial_rabbit_horizontal_slider.valueChanged.connect(self.slide_initial_rabbit)
+        self.initial_foxes_horizontal_slider.valueChanged.connect(self.slide_initial_foxes)
+        self.breeding_rabbits_horizontal_slider.valueChanged.connect(self.slide_breeding_rabbits)
+        self.breeding_foxes_horizontal_slider.valueChanged.connect(self.slide_breeding_foxes)
+        self.mortality_foxes_horizontal_slider.valueChanged.connect(self.slide_mortality_foxes)
+        self.effectiveness_foxes_horizontal_slider.valueChanged.connect(self.slide_effectiveness_foxes)
+        self.simulation_speed_horizontal_slider.valueChanged.connect(self.slide_simulation_speed)
+
+        # Define simulation parameters
+        self.simulation = Simulation(
+            world_size=int(self.world_size_label.text()),
+            initial_rabbit=int(self.initial_rabbits_label.text()),
+            initial_foxes=int(self.initial_foxes_label.text()),
+            breeding_rabbits=float(self.breeding_rabbits_label.text()),
+            breeding_foxes=float(self.breeding_foxes_label.text()),
+            mortality_foxes=float(self.mortality_foxes_label.text()),
+            effectiveness_foxes=float(self.effectiveness_foxes_label.text()),
+            engine=engine,
+            seed=seed,
+            boundary=boundary,
+            neighbourhood=neighbourhood,
+        )
+        self.simulation_speed=float(self.simulation_speed_label.text())
+
+        self.map_colors = ListedColormap(['white', 'red', 'green'])
+
+        self.view_widget = self.findChild(qtw.QWidget, "view_widget")
+        self.chart1_widget = self.findChild(qtw.QWidget, "chart1_widget")
+        self.chart2_widget = self.findChild(qtw.QWidget, "chart2_widget")
+
+        # View widget
+        self.fig = Figure()
+        self.canvas = FigureCanvas(self.fig)
+        self.renderer = WorldRenderer(self.canvas, self.map_colors, self.simulation.matrix_sim)
+        self.layout = qtw.QVBoxLayout(self.view_widget)
+        self.layout.addWidget(self.canvas)
+
+        self.history = PopulationHistory(window)
+        self.time = np.arange(window)
+        # Mean-field populations from forecast_tick on, solved with forecast_coefficient
+        self.mean_field = mean_field
+        self.forecast = None
+        self.forecast_tick = 0
+        self.forecast_coefficient = None
+        # The charts are built after the window is shown, see create_charts
+        self.chart1 = self.chart2 = None
+
+        # Define the button
+        self.start_push_button = self.findChild(qtw.QPushButton, "start_pushButton")
+        self.step_push_button = self.findChild(qtw.QPushButton, "step_pushButton")
+        self.reset_push_button = self.findChild(qtw.QPushButton, "reset_pushButton")
+
+        self.reset_push_button.setEnabled(False)
+        self.reset_push_button.hide()
+
+        self.start_push_button.clicked.connect(self.start_button_down)
+        self.step_push_button.clicked.connect(self.step_button_down)
+        self.reset_push_button.clicked.connect(self.reset_button_down)
+        # The model runs on its own thread, the window redraws the latest state at its refresh rate
+        self.worker = SimulationWorker(self.simulation)
+        self.worker_thread = QtCore.QThread()
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.start()
+        self.refresh_timer = QtCore.QTimer()
+        self.refresh_timer.timeout.connect(self.refresh_view)
+        self.last_refresh = (time.perf_counter(), 0)
+
+        # Save and load checkpoints while the simulation is stopped
+        self.save_shortcut = QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Save, self)
+        self.save_shortcut.activated.connect(self.save_checkpoint)
+        self.open_shortcut = QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Open, self)
+        self.open_shortcut.activated.connect(self.load_checkpoint)
+        self.mean_field_shortcut = QtGui.QShortcut(QtGui.QKeySequence("Ctrl+M"), self)
+        self.mean_field_shortcut.activated.connect(self.toggle_mean_field)
+
+        # Time the phases of every tick, shown over the world view and exported on demand
+        self.profiler = self.worker.profiler
+        self.profiler_label = qtw.QLabel(self.view_widget)
+        self.profiler_label.setStyleSheet("background-color: rgba(255, 255, 255, 200); font-family: monospace;")
+        self.profiler_label.hide()
+        self.profiler_shortcut = QtGui.QShortcut(QtGui.QKeySequence("Ctrl+P"), self)
+        self.profiler_shortcut.activated.connect(self.toggle_profiler)
+        self.export_shortcut = QtGui.QShortcut(QtGui.QKeySequence("Ctrl+E"), self)
+        self.export_shortcut.activated.connect(self.export_profile)
+        self.predict_mean_field()
+        if checkpoint is not None:
+            self.load_checkpoint(checkpoint)
+
+        QtCore.QTimer.singleShot(0, self.create_charts)
+
+    def create_charts(self) -> None:
+        """Build the population charts and draw the populations recorded so far
+        """
+        # Chart 1 widget
+        self.fig1 = Figure()
+        self.ax1 = self.fig1.add_subplot()
+        self.plot1, = self.ax1.plot([], [], 'bo', markersize= 3)
+        self.plot1_mean_field, = self.ax1.plot([], [], color='gray', linewidth=1, linestyle='--')
+        self.ax1.set_xlabel("rabbits population")
+        self.ax1.set_ylabel("foxes population")
+        self.canvas1 = FigureCanvas(self.fig1)
+        self.chart1 = BlitChart(self.canvas1, self.ax1, [self.plot1, self.plot1_mean_field], xlim=10, ylim=30)
+        self.layout1 = qtw.QVBoxLayout(self.chart1_widget)
+        self.layout1.addWidget(self.canvas1)
+        self.fig1.tight_layout(pad=7)
+
+        # Chart 2 widget
+        self.fig2 = Figure()
+        self.ax2 = self.fig2.add_subplot()
+        self.plot2_rabbit, = self.ax2.plot([], [], color= 'green', linewidth = 1, label = "Rabbit")
+        self.plot2_fox, = self.ax2.plot([], [], color= 'red', linewidth = 1, label = "Fox")
+        self.plot2_rabbit_mean_field, = self.ax2.plot([], [], color='green', linewidth=1, linestyle='--')
+        self.plot2_fox_mean_field, = self.ax2.plot([], [], color='red', linewidth=1, linestyle='--')
+        self.ax2.set_xticks([])
+        self.ax2.set_xlabel("time")
+        self.ax2.set_ylabel("population [%]")
+        self.ax2.legend(handles=[self.plot2_rabbit, self.plot2_fox])
+        self.canvas2 = FigureCanvas(self.fig2)
+        self.chart2 = BlitChart(self.canvas2, self.ax2, [self.plot2_rabbit, self.plot2_fox, self.plot2_rabbit_mean_field,
+                                                         self.plot2_fox_mean_field], xlim=len(self.time), ylim=40)
+        self.layout2 = qtw.QVBoxLayout(self.chart2_widget)
+        self.layout2.addWidget(self.canvas2)
+        self.fig2.tight_layout(pad=7)
+        self.update_population_charts([], self.simulation.tick)
+
+    def closeEvent(self, event) -> None:
+        """Stop the thread of the model when the window is closed
+        """
+        self.worker.stop()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        super(UI, self).closeEvent(event)
+
+    def redraw_view(self) -> None:
+        """Redraw the view with the new parameters
+        """
+        self.worker.take()
+        self.simulation.populate()
+        self.renderer.update(self.simulation.matrix_sim)
+        self.predict_mean_field()
+
+    # Slider functions
+    def slide_world_size(self, value: int) -> None:
+        """Change the world size
+
+        Arguments:
+            value -- size value for a world of dimension value x value
+        """
+        self.world_size_label.setText(str(10*value))
+        self.simulation.world_size=int(10*value)
+        # self.redraw_view()
+
+        self.worker.take()
+        self.simulation.populate()
+        self.renderer.update(self.simulation.matrix_sim)
+        self.predict_mean_field()
+
+    def slide_initial_rabbit(self, value: int) -> None:
+        """Change the initial rabbit population
+
+        Arguments:
+            value -- initial rabbit population
+        """
+        self.initial_rabbits_label.setText(str(value))
+        self.simulation.initial_rabbit=value
+        if int(self.initial_rabbits_label.text())+int(self.initial_foxes_label.text()) >= 100:
+            self.initial_foxes_horizontal_slider.setValue(100-int(self.initial_rabbits_label.text()))
+        self.redraw_view()
+
+    def slide_initial_foxes(self, value: int) -> None:
+        """Change the initial foxes population
+
+        Arguments:
+            value -- initial foxes population
+        """
+        self.initial_foxes_label.setText(str(value))
+        self.simulation.initial_foxes=value
+        if int(self.initial_rabbits_label.text())+int(self.initial_foxes_label.text()) >= 100:
+            self.initial_rabbit_horizontal_slider.setValue(100-int(self.initial_foxes_label.text()))
+        self.redraw_view()
+
+    def slide_breeding_rabbits(self, value: float) -> None:
+        """Change the breeding rate of rabbits
+
+        Arguments:
+            value -- breeding rate of rabbits
+        """
+        value /= 1000
+        self.breeding_rabbits_label.setText(str(value))
+        self.simulation.breeding_rabbits=value
+        self.predict_mean_field()
+
+    def slide_breeding_foxes(self, value: float) -> None:
+        """Change the breeding rate of foxes
+
+        Arguments:
+            value -- breeding rate of foxes
+        """
+        value /= 1000
+        self.breeding_foxes_label.setText(str(value))
+        self.simulation.breeding_foxes=value
+        self.predict_mean_field()
+
+    def slide_mortality_foxes(self, value: float) -> None:
+        """Change the mortality rate of foxes
+
+        Arguments:
+            value -- mortality rate of foxes
+        """
+        value /= 1000
+        self.mortality_foxes_label.setText(str(value))
+        self.simulation.mortality_foxes=value
+        self.predict_mean_field()
+
+    def slide_effectiveness_foxes(self, value: float) -> None:
+        """Change the effectiveness of foxes
+
+        Arguments:
+            value -- effectiveness of foxes
+        """
+        value /= 1000
+        self.effectiveness_foxes_label.setText(str(value))
+        self.simulation.effectiveness_foxes=value
+        self.predict_mean_field()
+
+    def slide_simulation_speed(self, value: float) -> None:
+        """Change the simulation speed
+
+        Arguments:
+            value -- simulation speed
+        """
+        max_speed = value == self.simulation_speed_horizontal_slider.maximum()
+        value /=10
+        self.simulation_speed_label.setText("max" if max_speed else str(value))
+        self.simulation_speed=value
+        self.worker.set_interval(self.tick_interval())
+
+    def tick_interval(self) -> int:
+        """Time between two ticks of the model
+
+        Returns:
+            interval in milliseconds, 0 at max speed to run the model as fast as possible
+        """
+        if self.simulation_speed_horizontal_slider.value() == self.simulation_speed_horizontal_slider.maximum():
+            return 0
+        return int(1001 - (1000*self.simulation_speed))
+
+    def update_population_charts(self, populations: list[tuple[float, float]], tick: int) -> None:
+        """Update the population charts
+
+        Arguments:
+            populations -- rabbit and fox population in percent of every new tick
+            tick -- tick of the simulation after the last of the populations
+        """
+        for rabbit_number_temp, fox_number_temp in populations:
+            self.history.append(rabbit_number_temp, fox_number_temp)
+        if self.chart1 is None:
+            return
+        rabbit, fox = self.history.rabbit, self.history.fox
+        rabbit_max, fox_max = (rabbit.max(), fox.max()) if len(self.history) else (0, 0)
+        mean_field = self.mean_field_window(tick - len(self.history))
+        # The forecast may leave the range of the history, its ticks before the start are nan
+        rabbit_max, fox_max = (max(limit, values[np.isfinite(values)].max(initial=0))
+                               for limit, values in zip((rabbit_max, fox_max), mean_field.T))
+
+        self.chart1.update([(rabbit, fox), (mean_field[:, 0], mean_field[:, 1])], rabbit_max, fox_max)
+
+        time = self.time[:len(self.history)]
+        mean_field_time = self.time[:len(mean_field)]
+        self.chart2.update([(time, rabbit), (time, fox), (mean_field_time, mean_field[:, 0]),
+                            (mean_field_time, mean_field[:, 1])], 0, max(rabbit_max, fox_max))
+
+    def reset_charts(self) -> None:
+        """Remove the lines of the charts and restore their initial limits, once the charts are built
+        """
+        if self.chart1 is not None:
+            self.chart1.reset()
+            self.chart2.reset()
+
+    def predict_mean_field(self) -> None:
+        """Start a new mean-field forecast from the current state of the simulation and redraw the charts
+        """
+        simulation = self.simulation
+        if not self.mean_field:
+            self.forecast = None
+            self.update_population_charts([], simulation.tick)
+            return
+        self.forecast_tick = simulation.tick
+        self.forecast_coefficient = coefficients(simulation.breeding_rabbits, simulation.breeding_foxes,
+                                                 simulation.mortality_foxes, simulation.effectiveness_foxes,
+                                                 len(NEIGHBOURHOODS[simulation.neighbourhood]))
+        self.forecast = solve(np.array(simulation.population()), self.forecast_coefficient,
+                              FORECAST_WINDOWS * len(self.time))
+        self.update_population_charts([], simulation.tick)
+
+    def mean_field_window(self, first_tick: int) -> np.ndarray:
+        """Mean-field populations of the ticks shown by the time chart
+
+        The forecast is extended when the charts reach its end, and the ticks before the window are dropped.
+
+        Arguments:
+            first_tick -- tick of the first population of the history
+
+        Returns:
+            rabbit and fox population in percent of the ticks of the window, nan before the forecast starts,
+            of shape (0, 2) when the overlay is off
+        """
+        if self.forecast is None:
+            return np.empty((0, 2))
+        window = len(self.time)
+        start = first_tick - self.forecast_tick
+        if start > 0:
+            self.forecast = self.forecast[start:]
+            self.forecast_tick = first_tick
+            start = 0
+        missing = start + window - len(self.forecast)
+        if missing > 0:
+            extension = solve(self.forecast[-1], self.forecast_coefficient, max(missing, FORECAST_WINDOWS * window) + 1)
+            self.forecast = np.concatenate((self.forecast, extension[1:]))
+        values = np.full((window, 2), np.nan)
+        if -start < window:
+            values[-start:] = self.forecast[:start + window]
+        return values
+
+    def toggle_mean_field(self) -> None:
+        """Show or hide the mean-field overlay of the charts, when the simulation is stopped
+        """
+        if self.start_push_button.text() != "Start":
+            self.statusBar().showMessage("Stop the simulation to toggle the mean-field overlay")
+            return
+        self.mean_field = not self.mean_field
+        self.predict_mean_field()
+
+    def update_model(self) -> None:
+        """Update the model of the simulation by one tick and redraw it
+        """
+        self.worker.step()
+        self.refresh_view()
+
+    def refresh_view(self) -> None:
+        """Draw the latest state of the model, the states since the last refresh are skipped
+        """
+        start = time.perf_counter()
+        matrix_sim, populations, tick = self.worker.take()
+        if not populations:
+            return
+        charts_start = time.perf_counter()
+        self.update_population_charts(populations, tick)
+        render_start = time.perf_counter()
+        self.renderer.update(matrix_sim)
+        if self.profiler.enabled:
+            # The drawn state is the one left by the step of the last record
+            now = time.perf_counter()
+            self.profiler.add(tick - 1, 'take', charts_start - start)
+            self.profiler.add(tick - 1, 'charts', render_start - charts_start)
+            self.profiler.add(tick - 1, 'render', now - render_start)
+            self.show_profile()
+
+        now = time.perf_counter()
+        last_time, last_tick = self.last_refresh
+        self.last_refresh = (now, tick)
+        frame_time = self.renderer.frame_time
+        self.statusBar().showMessage(f"model {(tick - last_tick)/(now - last_time):.0f} ticks/s, "
+                                     f"render {1000*frame_time:.1f} ms ({1/frame_time:.0f} fps)")
+
+    def toggle_profiler(self) -> None:
+        """Start or stop timing the ticks, with the overlay of the timings over the world view
+        """
+        self.profiler.enabled = not self.profiler.enabled
+        if self.profiler.enabled:
+            self.show_profile()
+            self.profiler_label.show()
+        else:
+            self.profiler_label.hide()
+
+    def show_profile(self) -> None:
+        """Write the mean and maximum time of every phase over the last ticks on the overlay
+        """
+        lines = [f"{'phase':>6} {'mean':>7} {'max':>7}  [ms]"]
+        for name, (mean, maximum) in self.profiler.summary(PROFILE_TICKS).items():
+            lines.append(f"{name:>6} {1000*mean:7.2f} {1000*maximum:7.2f}")
+        records = self.profiler.records
+        if len(records):
+            rabbits, foxes = records[-1, -2:]
+            lines.append(f"tick {records[-1, 0]:.0f}: {rabbits:.0f} rabbits, {foxes:.0f} foxes")
+        self.profiler_label.setText("\n".join(lines))
+        self.profiler_label.adjustSize()
+
+    def export_profile(self, path: str | None = None) -> None:
+        """Write the timings of the last ticks to a CSV or JSON file
+
+        Keyword Arguments:
+            path -- path of the file, JSON when it ends with .json (default: {None} to ask for it)
+        """
+        if not path:
+            path, _ = qtw.QFileDialog.getSaveFileName(self, "Export timings", "", "CSV (*.csv);;JSON (*.json)")
+            if not path:
+                return
+        self.profiler.export(path)
+        self.statusBar().showMessage(f"Exported the timings of {len(self.profiler)} ticks to {path}")
+
+    def start_button_down(self) -> None:
+        """Start the simulation
+        """
+        if self.start_push_button.text() == "Start":
+            self.last_refresh = (time.perf_counter(), self.simulation.tick)
+            self.worker.start_requested.emit(self.tick_interval())
+            self.refresh_timer.start(REFRESH_INTERVAL)
+            # self.start_push_button.setEnabled(False)
+            self.world_size_horizontal_slider.setEnabled(False)
+            self.initial_rabbit_horizontal_slider.setEnabled(False)
+            self.initial_foxes_horizontal_slider.setEnabled(False)
+            self.breeding_rabbits_horizontal_slider.setEnabled(False)
+            self.breeding_foxes_horizontal_slider.setEnabled(False)
+            self.mortality_foxes_horizontal_slider.setEnabled(False)
+            self.effectiveness_foxes_horizontal_slider.setEnabled(False)
+            self.start_push_button.setText('Stop')
+            self.reset_push_button.setEnabled(False)
+            self.reset_push_button.hide()
+            self.step_push_button.setEnabled(False)
+            self.step_push_button.hide()
+        else:
+            self.worker.stop()
+            self.refresh_timer.stop()
+            self.refresh_view()
+            # self.start_push_button.setEnabled(True)
+            self.world_size_horizontal_slider.setEnabled(True)
+            self.initial_rabbit_horizontal_slider.setEnabled(True)
+            self.initial_foxes_horizontal_slider.setEnabled(True)
+            self.breeding_rabbits_horizontal_slider.setEnabled(True)
+            self.breeding_foxes_horizontal_slider.setEnabled(True)
+            self.mortality_foxes_horizontal_slider.setEnabled(True)
+            self.effectiveness_foxes_horizontal_slider.setEnabled(True)
+            self.start_push_button.setText('Start')
+            self.reset_push_button.setEnabled(True)
+            self.reset_push_button.show()
+            self.step_push_button.setEnabled(True)
+            self.step_push_button.show()
+
+    def step_button_down(self) -> None:
+        """Step through the simulation
+        """
+        self.update_model()
+        self.reset_push_button.setEnabled(True)
+        self.reset_push_button.show()
+
+    def reset_button_down(self) -> None:
+        """Reset the simulation
+        """
+        self.reset_push_button.setEnabled(False)
+        self.reset_push_button.hide()
+        self.history.clear()
+        self.reset_charts()
+        self.redraw_view()
+
+    def save_checkpoint(self, path: str | None = None) -> None:
+        """Save the simulation and the population history, when the simulation is stopped
+
+        Keyword Arguments:
+            path -- path of the checkpoint file (default: {None} to ask for it)
+        """
+        if self.start_push_button.text() != "Start":
+            self.statusBar().showMessage("Stop the simulation to save a checkpoint")
+            return
+        if not path:
+            path, _ = qtw.QFileDialog.getSaveFileName(self, "Save checkpoint", "", "Checkpoints (*.ckpt)")
+            if not path:
+                return
+        self.refresh_view()
+        self.simulation.checkpoint(self.history).save(path)
+        self.statusBar().showMessage(f"Saved tick {self.simulation.tick} to {path}")
+
+    def load_checkpoint(self, path: str | None = None) -> None:
+        """Resume a saved simulation, when the simulation is stopped
+
+        Keyword Arguments:
+            path -- path of the checkpoint file (default: {None} to ask for it)
+        """
+        if self.start_push_button.text() != "Start":
+            self.statusBar().showMessage("Stop the simulation to load a checkpoint")
+            return
+        if not path:
+            path, _ = qtw.QFileDialog.getOpenFileName(self, "Load checkpoint", "", "Checkpoints (*.ckpt)")
+            if not path:
+                return
+        checkpoint = Checkpoint.load(path)
+        self.worker.take()
+        self.history.clear()
+        self.simulation.restore(checkpoint, self.history)
+        self.show_parameters()
+        self.renderer.update(self.simulation.matrix_sim)
+        self.reset_charts()
+        self.predict_mean_field()
+        self.statusBar().showMessage(f"Loaded tick {self.simulation.tick} from {path}")
+
+    def show_parameters(self) -> None:
+        """Show the parameters of the simulation on the labels and sliders, without populating a new world
+        """
+        simulation = self.simulation
+        for label, slider, text, value in [
+                (self.world_size_label, self.world_size_horizontal_slider,
+                 str(simulation.world_size), simulation.world_size // 10),
+                (self.initial_rabbits_label, self.initial_rabbit_horizontal_slider,
+                 str(simulation.initial_rabbit), simulation.initial_rabbit),
+                (self.initial_foxes_label, self.initial_foxes_horizontal_slider,
+                 str(simulation.initial_foxes), simulation.initial_foxes),
+                (self.breeding_rabbits_label, self.breeding_rabbits_horizontal_slider,
+                 str(simulation.breeding_rabbits), int(1000*simulation.breeding_rabbits)),
+                (self.breeding_foxes_label, self.breeding_foxes_horizontal_slider,
+                 str(simulation.breeding_foxes), int(1000*simulation.breeding_foxes)),
+                (self.mortality_foxes_label, self.mortality_foxes_horizontal_slider,
+                 str(simulation.mortality_foxes), int(1000*simulation.mortality_foxes)),
+                (self.effectiveness_foxes_label, self.effectiveness_foxes_horizontal_slider,
+                 str(simulation.effectiveness_foxes), int(1000*simulation.effectiveness_foxes))]:
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+            label.setText(text)
@@ -0,0 +1,103 @@
+"""
+This module contains the worker that runs a simulation on a background thread.
+
+The worker steps the simulation from a timer of its own thread, so the model runs at its own rate
+while the window redraws at the refresh rate of the screen. After every tick the worker publishes
+a copy of the world, so the window takes the latest state whenever it redraws without waiting for
+the tick in progress, and the states in between are never drawn. It also gets the populations
+of every tick for the charts. The ticks are timed by the profiler of the worker while it is enabled.
+
+Stopping waits for the tick in progress, so the window may change the simulation once stop returns.
+"""
+
+import threading
+
+import numpy as np
+from PyQt6 import QtCore
+
+from profiler import TickProfiler, run
+from simulation import Simulation
+
+
+class SimulationWorker(QtCore.QObject):
+    """
+    Class to advance a simulation on the thread it is moved to
+    """
+
+    start_requested = QtCore.pyqtSignal(int)
+    # Connected with a blocking connection, emitted by stop
+    stop_requested = QtCore.pyqtSignal()
+
+    def __init__(self, simulation: Simulation) -> None:
+        """Create an idle worker
+
+        Arguments:
+            simulation -- simulation to advance
+        """
+        super(SimulationWorker, self).__init__()
+        self.simulation = simulation
+        self.lock = threading.Lock()
+        self.populations = []
+        # Latest state published by step, read by take
+        self.matrix_sim = simulation.matrix_sim.copy()
+        self.tick = simulation.tick
+        self.profiler = TickProfiler()
+        self.timer = None
+        self.start_requested.connect(self._start)
+        self.stop_requested.connect(self._stop, QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+
+    @QtCore.pyqtSlot(int)
+    def _start(self, interval: int) -> None:
+        """Start stepping, on the thread of the worker
+
+        Arguments:
+            interval -- time between two ticks in milliseconds, 0 to run as fast as possible
+        """
+        if self.timer is None:
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self.step)
+        self.timer.start(interval)
+
+    @QtCore.pyqtSlot()
+    def _stop(self) -> None:
+        """Stop stepping, on the thread of the worker
+        """
+        if self.timer is not None:
+            self.timer.stop()
+
+    def stop(self) -> None:
+        """Stop stepping and wait until the tick in progress is finished
+        """
+        if self.thread() == QtCore.QThread.currentThread():
+            self._stop()
+        elif self.thread().isRunning():
+            self.stop_requested.emit()
+
+    def set_interval(self, interval: int) -> None:
+        """Change the time between two ticks while running
+
+        Arguments:
+            interval -- time between two ticks in milliseconds, 0 to run as fast as possible
+        """
+        if self.timer is not None and self.timer.isActive():
+            self.start_requested.emit(interval)
+
+    def step(self) -> None:
+        """Record the populations, advance the simulation by one tick and publish its new state
+        """
+        populations = run(self.simulation, 1, self.profiler)
+        matrix_sim = self.simulation.matrix_sim.copy()
+        with self.lock:
+            self.matrix_sim, self.tick = matrix_sim, self.simulation.tick
+            self.populations.extend(populations)
+
+    def take(self) -> tuple[np.ndarray, list[tuple[float, float]], int]:
+        """Take the latest published state of the simulation
+
+        Returns:
+            copy of the world matrix after the last tick, populations of the ticks since the last call
+            and tick of the copy
+        """
+        with self.lock:
+            populations, self.populations = self.populations, []
+            return self.matrix_sim, populations, self.tick